@@ -33,11 +33,15 @@ import math
 import operator
 import re
 import sys
+import threading
+import weakref
 from functools import reduce, wraps
+from inspect import CO_COROUTINE
 from sys import intern
 from typing import (
     Any, Callable, ClassVar, Dict, Generic, Hashable, Iterable, Iterator, List,
-    Mapping, Optional, Sequence, Set, Tuple, Type, TypeVar, Union)
+    Mapping, MutableMapping, NamedTuple, Optional, Sequence, Set, Tuple, Type,
+    TypeVar, Union, overload)
 
 
 try:
@@ -79,6 +83,7 @@ Memoization
 -----------
 
 .. autofunction:: memoize
+.. autofunction:: weak_memoize
 .. autofunction:: memoize_on_first_arg
 .. autofunction:: memoize_method
 .. autofunction:: memoize_in
@@ -86,6 +91,14 @@ Memoization
 .. autofunction:: keyed_memoize_method
 .. autofunction:: keyed_memoize_in
 
+Memoization statistics
+----------------------
+
+.. autofunction:: enable_memoize_stats
+.. autofunction:: memoize_stats
+.. autoclass:: MemoizeCacheStats
+.. autofunction:: enforce_memoize_memory_budget
+
 Argmin/max
 ----------
 
@@ -668,19 +681,609 @@ def single_valued(
 
 # {{{ memoization / attribute storage
 
+# {{{ memoization statistics
+
+def _memoize_stats_enabled_from_env() -> bool:
+    import os
+    return bool(os.environ.get("PYTOOLS_MEMOIZE_STATS", ""))
+
+
+_MEMOIZE_STATS_ENABLED = _memoize_stats_enabled_from_env()
+
+# Maps id(cache) to all live tracked caches (values are weakly referenced).
+_MEMOIZE_REGISTRY: "weakref.WeakValueDictionary[int, _TrackedMemoizeCache]" = \
+        weakref.WeakValueDictionary()
+
+
+class _TrackedMemoizeCache(MutableMapping[Any, Any]):
+    def __init__(self, name: str, cache: MutableMapping[Any, Any]) -> None:
+        self.name = name
+        self.cache = cache
+        self.hits = 0
+        self.misses = 0
+
+    def __getitem__(self, key: Any) -> Any:
+        result = self.cache[key]
+        self.hits += 1
+        return result
+
+    def __setitem__(self, key: Any, value: Any) -> None:
+        # Results are only stored after a miss, and the first miss happens
+        # before the cache is created.
+        self.misses += 1
+        self.cache[key] = value
+
+    def __delitem__(self, key: Any) -> None:
+        del self.cache[key]
+
+    def __contains__(self, key: object) -> bool:
+        return key in self.cache
+
+    def __iter__(self) -> Iterator[Any]:
+        return iter(self.cache)
+
+    def __len__(self) -> int:
+        return len(self.cache)
+
+    def clear(self) -> None:
+        self.cache.clear()
+
+
+class MemoizeCacheStats(NamedTuple):
+    """Usage statistics of one memoization cache, as returned by
+    :func:`memoize_stats`.
+
+    .. attribute:: name
+    .. attribute:: hits
+    .. attribute:: misses
+    .. attribute:: entries
+    .. attribute:: nbytes
+
+        The approximate memory used by the cache, its keys and its values, as
+        computed by :func:`pytools.debug.estimate_memory_usage`.
+
+    .. versionadded:: 2024.1.2
+    """
+
+    name: str
+    hits: int
+    misses: int
+    entries: int
+    nbytes: int
+
+
+def enable_memoize_stats(enable: bool = True) -> None:
+    """Start (or stop) tracking the caches of :func:`memoize` and its relatives
+    for :func:`memoize_stats` and :func:`enforce_memoize_memory_budget`.
+
+    Only caches created after this call are tracked. Since caches are created
+    when the memoized function is first called, not when it is decorated, this
+    covers functions defined before the call as well. Tracking may also be
+    enabled on import by setting the environment variable
+    :envvar:`PYTOOLS_MEMOIZE_STATS` to a non-empty value.
+
+    Tracked caches incur a small overhead on every lookup.
+
+    .. versionadded:: 2024.1.2
+    """
+    global _MEMOIZE_STATS_ENABLED
+    _MEMOIZE_STATS_ENABLED = enable
+
+
+def _get_tracked_memoize_caches() -> List[_TrackedMemoizeCache]:
+    return list(_MEMOIZE_REGISTRY.values())
+
+
+def memoize_stats() -> List[MemoizeCacheStats]:
+    """Return a list of :class:`MemoizeCacheStats` for all live tracked caches
+    (see :func:`enable_memoize_stats`), largest first.
+
+    .. note::
+
+        Estimating the memory usage traverses all objects reachable from the
+        cached keys and values and may take a while.
+
+    .. versionadded:: 2024.1.2
+    """
+    from pytools.debug import estimate_memory_usage
+
+    return sorted((
+            MemoizeCacheStats(
+                name=cache.name,
+                hits=cache.hits,
+                misses=cache.misses,
+                entries=len(cache),
+                nbytes=estimate_memory_usage(cache.cache))
+            for cache in _get_tracked_memoize_caches()),
+            key=lambda stats: stats.nbytes, reverse=True)
+
+
+def enforce_memoize_memory_budget(max_nbytes: int, policy: str = "largest") -> int:
+    """Clear tracked caches (see :func:`enable_memoize_stats`) until their
+    estimated total memory usage is at most *max_nbytes*.
+
+    :arg policy: the order in which caches are cleared. ``"largest"`` clears
+        the caches using the most memory first, ``"coldest"`` those with the
+        fewest hits.
+    :returns: the estimated number of bytes freed.
+
+    .. versionadded:: 2024.1.2
+    """
+    from pytools.debug import estimate_memory_usage
+
+    sized_caches = [
+            (cache, estimate_memory_usage(cache.cache))
+            for cache in _get_tracked_memoize_caches()]
+
+    if policy == "largest":
+        sized_caches.sort(key=lambda cache_and_size: -cache_and_size[1])
+    elif policy == "coldest":
+        sized_caches.sort(key=lambda cache_and_size: cache_and_size[0].hits)
+    else:
+        raise ValueError(f"unknown eviction policy: '{policy}'")
+
+    total_nbytes = sum(nbytes for _, nbytes in sized_caches)
+    freed_nbytes = 0
+
+    for cache, nbytes in sized_caches:
+        if total_nbytes - freed_nbytes <= max_nbytes:
+            break
+
+        cache.clear()
+        freed_nbytes += nbytes
+
+    return freed_nbytes
+
+# }}}
+
+
+def _make_memoize_cache(
+        maxsize: Optional[int], name: Optional[str] = None
+        ) -> MutableMapping[Any, Any]:
+    cache: MutableMapping[Any, Any]
+    if maxsize is None:
+        cache = {}
+    else:
+        from pytools.persistent_dict import _LRUCache
+        cache = _LRUCache(maxsize)
+
+    if _MEMOIZE_STATS_ENABLED:
+        cache = _TrackedMemoizeCache(name or "<unknown>", cache)
+        _MEMOIZE_REGISTRY[id(cache)] = cache
+
+    return cache
+
+
+def _memoize_cache_name(function: Callable[..., Any]) -> str:
+    return f"{function.__module__}.{function.__qualname__}"
+
+
+# {{{ coroutine support
+
+class _MemoizedCoroutineResult:
+    """Stands in for the result of a coroutine function in a memoization
+    cache. The first :meth:`get` starts the coroutine as a task; concurrent
+    callers await the same task, later ones receive the stored result. If
+    the coroutine raises, the exception is propagated to all waiting callers
+    and the next :meth:`get` starts it anew.
+    """
+
+    def __init__(self, func: Callable[..., Any], args: Tuple[Any, ...],
+            kwargs: Dict[str, Any]) -> None:
+        self.func: Optional[Callable[..., Any]] = func
+        self.args = args
+        self.kwargs = kwargs
+        self.task: Any = None
+        self.has_result = False
+        self.result: Any = None
+
+    async def get(self) -> Any:
+        if self.has_result:
+            return self.result
+
+        import asyncio
+
+        if self.task is None or (
+                self.task.get_loop() is not asyncio.get_running_loop()):
+            assert self.func is not None
+            self.task = asyncio.ensure_future(
+                    self.func(*self.args, **self.kwargs))
+
+        task = self.task
+        try:
+            # do not cancel the shared computation if one caller is cancelled
+            result = await asyncio.shield(task)
+        except BaseException:
+            if task.done() and self.task is task:
+                self.task = None
+            raise
+
+        if not self.has_result:
+            self.result = result
+            self.has_result = True
+
+            # do not keep the arguments alive
+            self.func = None
+            self.args = ()
+            self.kwargs = {}
+            self.task = None
+
+        return result
+
+
+def _is_coroutine_function(func: Any) -> bool:
+    """A cheaper :func:`inspect.iscoroutinefunction` for plain functions, for
+    use in :class:`memoize_in`, which is instantiated on every call of the
+    function enclosing it.
+    """
+    code = getattr(func, "__code__", None)
+    return code is not None and bool(code.co_flags & CO_COROUTINE)
+
+
+def _memoize_coroutine_function(
+        memoize_sync: Callable[..., Any],
+        func: Callable[..., Any]) -> Callable[..., Any]:
+    """Memoize the coroutine function *func* using *memoize_sync*, which
+    memoizes an ordinary function. Results are cached once awaited, and
+    concurrent callers with the same arguments share a single computation.
+    """
+    from functools import update_wrapper
+
+    def start(*args: Any, **kwargs: Any) -> _MemoizedCoroutineResult:
+        return _MemoizedCoroutineResult(func, args, kwargs)
+
+    update_wrapper(start, func)
+    memoized_start = memoize_sync(start)
+
+    async def wrapper(*args: Any, **kwargs: Any) -> Any:
+        return await memoized_start(*args, **kwargs).get()
+
+    # also carries over clear_cache, if present
+    update_wrapper(wrapper, memoized_start)
+    wrapper.__wrapped__ = func  # type: ignore[attr-defined]
+
+    return wrapper
+
+# }}}
+
+
+# {{{ single-flight computation for thread-safe memoization
+
+# Guards cache creation, LRU cache access and the registry of in-flight
+# computations for all thread-safe memoization caches. It is never held while
+# the memoized function runs.
+_MEMOIZE_LOCK = threading.Lock()
+
+
+class _MemoizeInFlight:
+    def __init__(self) -> None:
+        self.done = threading.Event()
+        self.result: Any = None
+        self.exception: Optional[BaseException] = None
+
+
+_MEMOIZE_IN_FLIGHT: Dict[Tuple[int, Hashable], _MemoizeInFlight] = {}
+
+
+def _memoize_single_flight(
+        cache: MutableMapping[Any, Any], key: Hashable,
+        compute: Callable[[], R]) -> R:
+    """Return *cache[key]*, computing and storing it with *compute* if needed.
+    Concurrent callers for the same *cache* and *key* wait for a single
+    call to *compute* and receive its result or exception.
+    """
+    flight_key = (id(cache), key)
+
+    with _MEMOIZE_LOCK:
+        try:
+            return cache[key]
+        except KeyError:
+            pass
+
+        flight = _MEMOIZE_IN_FLIGHT.get(flight_key)
+        is_owner = flight is None
+        if flight is None:
+            flight = _MEMOIZE_IN_FLIGHT[flight_key] = _MemoizeInFlight()
+
+    if not is_owner:
+        flight.done.wait()
+        if flight.exception is not None:
+            raise flight.exception
+        return flight.result
+
+    try:
+        result = compute()
+    except BaseException as exc:
+        flight.exception = exc
+        with _MEMOIZE_LOCK:
+            del _MEMOIZE_IN_FLIGHT[flight_key]
+        flight.done.set()
+        raise
+
+    flight.result = result
+    with _MEMOIZE_LOCK:
+        cache[key] = result
+        del _MEMOIZE_IN_FLIGHT[flight_key]
+    flight.done.set()
+
+    return result
+
+# }}}
+
+
+# {{{ cache storage on objects that do not allow setting attributes
+
+# Caches for objects that neither allow setting attributes nor have a
+# "_pytools_memo" slot, keyed by the id of the object. Entries are removed
+# by a weakref.finalize callback when the object is collected.
+_MEMOIZE_WEAK_CACHES: Dict[int, Dict[str, Any]] = {}
+
+
+def _memoize_fallback_caches(
+        obj: Any, create: bool = False) -> Optional[Dict[str, Any]]:
+    """Return the :class:`dict` mapping attribute names to caches for *obj*,
+    for use when the caches cannot be stored as attributes of *obj* (e.g.
+    because its class has :attr:`~object.__slots__`). This is the value of
+    the ``_pytools_memo`` slot, if present, and otherwise a :class:`dict`
+    associated with *obj* through a weak reference. If *create* is *False*,
+    return *None* if the :class:`dict` does not exist yet.
+    """
+    caches = getattr(obj, "_pytools_memo", None)
+    if caches is not None:
+        return caches
+
+    caches = _MEMOIZE_WEAK_CACHES.get(id(obj))
+    if caches is not None or not create:
+        return caches
+
+    caches = {}
+    try:
+        object.__setattr__(obj, "_pytools_memo", caches)
+    except AttributeError:
+        try:
+            weakref.finalize(obj, _MEMOIZE_WEAK_CACHES.pop, id(obj), None)
+        except TypeError:
+            raise TypeError(
+                    f"cannot memoize on object of type '{type(obj).__name__}': "
+                    "it does not allow setting attributes and has neither a "
+                    "'_pytools_memo' nor a '__weakref__' slot") from None
+
+        _MEMOIZE_WEAK_CACHES[id(obj)] = caches
+
+    return caches
+
+
+def _get_fallback_memoize_cache(obj: Any, cache_dict_name: str) -> Any:
+    """Return the cache *cache_dict_name* for *obj* stored by
+    :func:`_set_memoize_cache` other than as an attribute, or *None*.
+    """
+    caches = _memoize_fallback_caches(obj)
+    if caches is None:
+        return None
+    return caches.get(cache_dict_name)
+
+
+def _set_memoize_cache(obj: Any, cache_dict_name: str, cache_dict: Any) -> None:
+    try:
+        object.__setattr__(obj, cache_dict_name, cache_dict)
+    except AttributeError:
+        caches = _memoize_fallback_caches(obj, create=True)
+        assert caches is not None
+        caches[cache_dict_name] = cache_dict
+
+
+def _del_memoize_cache(obj: Any, cache_dict_name: str) -> None:
+    try:
+        object.__delattr__(obj, cache_dict_name)
+    except AttributeError:
+        caches = _memoize_fallback_caches(obj)
+        if caches is None or cache_dict_name not in caches:
+            raise
+        del caches[cache_dict_name]
+
+# }}}
+
+
+# {{{ signature-normalized cache keys
+
+def _make_signature_key_func(
+        func: Callable[..., Any], skip_first: bool = False
+        ) -> Callable[..., Hashable]:
+    """Return a function accepting the same arguments as *func* that returns
+    a cache key in which each argument appears in its signature position, so
+    that e.g. ``f(1, 2)``, ``f(1, b=2)`` and ``f(a=1, b=2)`` map to the same
+    key. Omitted arguments are filled in from the defaults of *func*.
+
+    The key function is generated once per signature, so that the binding is
+    done by the interpreter's argument parsing rather than by
+    :meth:`inspect.Signature.bind`.
+
+    :arg skip_first: If *True*, the first argument is not part of the key.
+    """
+    from inspect import Parameter, signature
+    params = list(signature(func).parameters.values())
+
+    arg_strs = []
+    key_strs = []
+    defaults = []
+    kwdefaults = {}
+    had_kw_separator = False
+    for iparam, param in enumerate(params):
+        name = param.name
+        if param.kind == Parameter.VAR_POSITIONAL:
+            arg_strs.append(f"*{name}")
+            had_kw_separator = True
+        elif param.kind == Parameter.VAR_KEYWORD:
+            arg_strs.append(f"**{name}")
+            name = f"frozenset({name}.items())"
+        else:
+            if param.kind == Parameter.KEYWORD_ONLY and not had_kw_separator:
+                arg_strs.append("*")
+                had_kw_separator = True
+
+            if param.default is Parameter.empty:
+                arg_strs.append(name)
+            else:
+                # The actual default values are assigned below.
+                arg_strs.append(f"{name}=None")
+                if param.kind == Parameter.KEYWORD_ONLY:
+                    kwdefaults[name] = param.default
+                else:
+                    defaults.append(param.default)
+
+            if (param.kind == Parameter.POSITIONAL_ONLY
+                    and (iparam + 1 == len(params)
+                        or params[iparam + 1].kind != Parameter.POSITIONAL_ONLY)):
+                arg_strs.append("/")
+
+        if not (skip_first and iparam == 0):
+            key_strs.append(name)
+
+    from pytools.py_codegen import PythonFunctionGenerator
+    gen = PythonFunctionGenerator("memoize_key", arg_strs)
+    gen("return ({}{})".format(
+        ", ".join(key_strs), "," if len(key_strs) == 1 else ""))
+
+    key_func = gen.get_function()
+    key_func.__defaults__ = tuple(defaults) or None
+    key_func.__kwdefaults__ = kwdefaults or None
+    return key_func
+
+# }}}
+
+
+# {{{ arity-specialized wrappers for memoize_on_first_arg
+
+def _make_specialized_memoize_wrapper(
+        function: Callable[..., Any], cache_dict_name: str,
+        maxsize: Optional[int]) -> Optional[Callable[..., Any]]:
+    """Return a generated wrapper for :func:`memoize_on_first_arg` that is
+    specialized to the positional arity of *function*, or *None* if
+    the signature of *function* has anything other than positional
+    parameters.
+
+    Arguments are bound to the signature of *function*, with omitted arguments
+    filled in from its defaults. For calls passing all arguments by position,
+    the cache keys agree with those of the generic wrapper.
+    """
+    from inspect import Parameter, signature
+    params = list(signature(function).parameters.values())
+
+    if not params or any(
+            param.kind not in (
+                Parameter.POSITIONAL_ONLY, Parameter.POSITIONAL_OR_KEYWORD)
+            or param.name.startswith("_memoize_")
+            for param in params):
+        return None
+
+    arg_strs = []
+    defaults = []
+    for iparam, param in enumerate(params):
+        if param.default is Parameter.empty:
+            arg_strs.append(param.name)
+        else:
+            # The actual default values are assigned below.
+            arg_strs.append(f"{param.name}=None")
+            defaults.append(param.default)
+
+        if (param.kind == Parameter.POSITIONAL_ONLY
+                and (iparam + 1 == len(params)
+                    or params[iparam + 1].kind != Parameter.POSITIONAL_ONLY)):
+            arg_strs.append("/")
+
+    obj_name = params[0].name
+    call_args = ", ".join(param.name for param in params)
+    key_names = [param.name for param in params[1:]]
+    key = "({}{})".format(", ".join(key_names), "," if len(key_names) == 1 else "")
+
+    if cache_dict_name.isidentifier():
+        get_cache_dict = f"{obj_name}.{cache_dict_name}"
+    else:
+        get_cache_dict = f"_memoize_getattr({obj_name}, _memoize_cache_dict_name)"
+
+    from pytools.py_codegen import PythonFunctionGenerator
+    gen = PythonFunctionGenerator("make_wrapper", [
+        "_memoize_function", "_memoize_make_cache", "_memoize_cache_dict_name",
+        "_memoize_get_fallback_cache", "_memoize_set_cache"])
+    gen("_memoize_getattr = getattr")
+    gen("")
+    gen("def wrapper({}):".format(", ".join(arg_strs)))
+    gen.indent()
+    gen(f"""
+        try:
+            return {get_cache_dict}[{key}]
+        except AttributeError:
+            _memoize_cache_dict = _memoize_get_fallback_cache(
+                {obj_name}, _memoize_cache_dict_name)
+            if _memoize_cache_dict is not None:
+                try:
+                    return _memoize_cache_dict[{key}]
+                except KeyError:
+                    pass
+        except KeyError:
+            _memoize_cache_dict = {get_cache_dict}
+
+        _memoize_result = _memoize_function({call_args})
+
+        if _memoize_cache_dict is None:
+            _memoize_cache_dict = _memoize_make_cache()
+            _memoize_set_cache(
+                {obj_name}, _memoize_cache_dict_name, _memoize_cache_dict)
+
+        _memoize_cache_dict[{key}] = _memoize_result
+        return _memoize_result
+        """)
+    gen.dedent()
+    gen("")
+    gen("return wrapper")
+
+    wrapper = gen.get_function()(
+            function,
+            lambda: _make_memoize_cache(maxsize, _memoize_cache_name(function)),
+            cache_dict_name, _get_fallback_memoize_cache, _set_memoize_cache)
+    wrapper.__defaults__ = tuple(defaults) or None
+    return wrapper
+
+# }}}
+
+
 def memoize(*args: F, **kwargs: Any) -> F:
     """Stores previously computed function values in a cache.
 
-    Two keyword-only arguments are supported:
+    Coroutine functions are supported: the result of awaiting the coroutine is
+    cached, and concurrent awaits for the same arguments share a single
+    computation. Exceptions are not cached.
+
+    Five keyword-only arguments are supported:
 
     :arg use_kwargs: Allows the caller to use keyword arguments. Defaults to
         ``False``. Setting this to ``True`` has a non-negligible performance
         impact.
+    :arg use_signature: Allows the caller to use keyword arguments, and
+        normalizes the arguments against the signature of the function, so
+        that e.g. ``f(1, 2)`` and ``f(1, b=2)`` share a cache entry. Omitted
+        arguments with defaults are filled in. The per-call overhead is lower
+        than that of *use_kwargs*. May not be combined with *use_kwargs* or
+        *key*. Defaults to ``False``.
     :arg key: A function receiving the same arguments as the decorated function
         which computes and returns the cache key.
+    :arg maxsize: If not *None*, keep at most *maxsize* results, discarding
+        the least recently used ones. Defaults to *None* (unbounded).
+    :arg thread_safe: If *True*, concurrent calls that miss the cache for the
+        same key wait for a single evaluation of the function, and receive its
+        result or exception. Cache hits do not take a lock unless *maxsize* is
+        given. Defaults to *False*.
+
+    .. versionchanged:: 2024.1.2
+
+        Added *maxsize*, *thread_safe* and *use_signature*, and support for
+        coroutine functions.
     """
 
     use_kw = bool(kwargs.pop("use_kwargs", False))
+    use_signature = bool(kwargs.pop("use_signature", False))
+    maxsize = kwargs.pop("maxsize", None)
+    thread_safe = bool(kwargs.pop("thread_safe", False))
 
     default_key_func: Optional[Callable[..., Any]]
 
@@ -697,16 +1300,60 @@ def memoize(*args: F, **kwargs: Any) -> F:
             "memoize received unexpected keyword arguments: {}".format(
                 ", ".join(kwargs.keys())))
 
-    if key_func is not None:
+    if use_signature and key_func is not None:
+        raise TypeError(
+            "memoize: use_signature may not be combined with use_kwargs or key")
+
+    if thread_safe:
+        def _decorator(func):
+            func_key_func = (
+                    _make_signature_key_func(func) if use_signature else key_func)
+
+            def wrapper(*args, **kwargs):
+                if func_key_func is not None:
+                    key = func_key_func(*args, **kwargs)
+                elif kwargs:
+                    raise TypeError(f"{func.__name__}: memoize without "
+                            "use_kwargs or key does not support keyword arguments")
+                else:
+                    key = args
+
+                if maxsize is None:
+                    # lock-free fast path
+                    try:
+                        return func._memoize_dic[key]  # noqa: E501 # pylint: disable=protected-access
+                    except (AttributeError, KeyError):
+                        pass
+
+                with _MEMOIZE_LOCK:
+                    try:
+                        cache = func._memoize_dic  # pylint: disable=protected-access
+                    except AttributeError:
+                        cache = func._memoize_dic = _make_memoize_cache(  # noqa: E501 # pylint: disable=protected-access
+                                maxsize, _memoize_cache_name(func))
+
+                return _memoize_single_flight(
+                        cache, key, lambda: func(*args, **kwargs))
+
+            from functools import update_wrapper
+            update_wrapper(wrapper, func)
+            return wrapper
+
+    elif key_func is not None or use_signature:
         def _decorator(func):
+            func_key_func = (
+                    _make_signature_key_func(func) if use_signature else key_func)
+
             def wrapper(*args, **kwargs):
-                key = key_func(*args, **kwargs)
+                key = func_key_func(*args, **kwargs)
                 try:
                     return func._memoize_dic[key]  # noqa: E501 # pylint: disable=protected-access
                 except AttributeError:
                     # _memoize_dic doesn't exist yet.
                     result = func(*args, **kwargs)
-                    func._memoize_dic = {key: result}  # noqa: E501 # pylint: disable=protected-access
+                    func._memoize_dic = _make_memoize_cache(  # noqa: E501 # pylint: disable=protected-access
+                            maxsize, _memoize_cache_name(func))
+                    func._memoize_dic[key] = result  # noqa: E501 # pylint: disable=protected-access
                     return result
                 except KeyError:
                     result = func(*args, **kwargs)
@@ -725,7 +1372,9 @@ def memoize(*args: F, **kwargs: Any) -> F:
                 except AttributeError:
                     # _memoize_dic doesn't exist yet.
                     result = func(*args)
-                    func._memoize_dic = {args: result}  # noqa: E501 # pylint:disable=protected-access
+                    func._memoize_dic = _make_memoize_cache(  # noqa: E501 # pylint:disable=protected-access
+                            maxsize, _memoize_cache_name(func))
+                    func._memoize_dic[args] = result  # noqa: E501 # pylint: disable=protected-access
                     return result
                 except KeyError:
                     result = func(*args)
@@ -736,10 +1385,17 @@ def memoize(*args: F, **kwargs: Any) -> F:
             update_wrapper(wrapper, func)
             return wrapper
 
+    def _decorator_maybe_async(func):
+        from inspect import iscoroutinefunction
+        if iscoroutinefunction(func):
+            return _memoize_coroutine_function(_decorator, func)
+        else:
+            return _decorator(func)
+
     if not args:
-        return _decorator  # type: ignore
+        return _decorator_maybe_async  # type: ignore
     if callable(args[0]) and len(args) == 1:
-        return _decorator(args[0])
+        return _decorator_maybe_async(args[0])
     raise TypeError(
         f"memoize received unexpected position arguments: {args}")
 
@@ -747,24 +1403,199 @@ def memoize(*args: F, **kwargs: Any) -> F:
 FunctionValueCache = memoize
 
 
+def _weak_memoize_key_entry(
+        arg: Any, callback: Optional[Callable[[Any], None]] = None) -> Any:
+    try:
+        return weakref.ref(arg, callback)
+    except TypeError:
+        # not weakly referenceable (e.g. int, str, tuple), keep as is
+        return arg
+
+
+def weak_memoize(func: F) -> F:
+    """Like :func:`memoize`, but only holds weak references to the arguments
+    that support them. Once any of those is garbage-collected, the cache
+    entry for the call is removed. Arguments that cannot be weakly referenced
+    (such as :class:`int`, :class:`str` or :class:`tuple`) are kept as part of
+    the key as usual.
+
+    Arguments are compared by equality, as with :func:`memoize`. The
+    decorated function may only receive positional arguments.
+
+    Coroutine functions are supported as in :func:`memoize`.
+
+    .. note::
+
+        If the result refers to one of the arguments, the argument is kept
+        alive by the cache and its entry is never removed.
+
+    .. versionadded:: 2024.1.2
+    """
+    from inspect import iscoroutinefunction
+    if iscoroutinefunction(func):
+        return _memoize_coroutine_function(weak_memoize, func)  # type: ignore
+
+    cache = _make_memoize_cache(None, _memoize_cache_name(func))
+    func._memoize_dic = cache  # type: ignore[attr-defined]
+
+    def wrapper(*args: Any) -> Any:
+        lookup_key = tuple([_weak_memoize_key_entry(arg) for arg in args])
+        try:
+            return cache[lookup_key]
+        except KeyError:
+            pass
+
+        result = func(*args)
+
+        key: Optional[Tuple[Any, ...]] = None
+
+        def remove(_: Any) -> None:
+            cache.pop(key, None)
+
+        key = tuple([_weak_memoize_key_entry(arg, remove) for arg in args])
+        cache[key] = result
+        return result
+
+    from functools import update_wrapper
+    return update_wrapper(wrapper, func)  # type: ignore[return-value]
+
+
 class _HasKwargs:
     pass
 
 
+@overload
 def memoize_on_first_arg(
         function: Callable[Concatenate[T, P], R], *,
-        cache_dict_name: Optional[str] = None) -> Callable[Concatenate[T, P], R]:
+        cache_dict_name: Optional[str] = None,
+        maxsize: Optional[int] = None,
+        thread_safe: bool = False,
+        use_signature: bool = False,
+        specialize: bool = False) -> Callable[Concatenate[T, P], R]:
+    ...
+
+
+@overload
+def memoize_on_first_arg(
+        function: None = None, *,
+        cache_dict_name: Optional[str] = None,
+        maxsize: Optional[int] = None,
+        thread_safe: bool = False,
+        use_signature: bool = False,
+        specialize: bool = False
+        ) -> Callable[
+                [Callable[Concatenate[T, P], R]],
+                Callable[Concatenate[T, P], R]]:
+    ...
+
+
+def memoize_on_first_arg(
+        function: Optional[Callable[Concatenate[T, P], R]] = None, *,
+        cache_dict_name: Optional[str] = None,
+        maxsize: Optional[int] = None,
+        thread_safe: bool = False,
+        use_signature: bool = False,
+        specialize: bool = False) -> Any:
     """Like :func:`memoize_method`, but for functions that take the object
     in which do memoization information is stored as first argument.
 
     Supports cache deletion via ``function_name.clear_cache(self)``.
+
+    If *function* is not given, a decorator is returned. Coroutine functions
+    are supported as in :func:`memoize`.
+
+    The cache is stored as an attribute of the object. If that is not
+    possible because the class of the object uses :attr:`~object.__slots__`,
+    the caches are stored in a ``_pytools_memo`` slot if the class declares
+    one, and are otherwise associated with the object through a weak
+    reference (which requires a ``__weakref__`` slot). Declaring
+    ``_pytools_memo`` is the faster of the two.
+
+    :arg maxsize: If not *None*, keep at most *maxsize* results per object,
+        discarding the least recently used ones. Defaults to *None*
+        (unbounded).
+    :arg thread_safe: If *True*, concurrent calls that miss the cache for the
+        same object and arguments wait for a single evaluation of the
+        function, and receive its result or exception. Cache hits do not take
+        a lock unless *maxsize* is given. Defaults to *False*.
+    :arg use_signature: If *True*, normalize the arguments against the
+        signature of *function* (see :func:`memoize`), so that passing an
+        argument by position or by keyword yields the same cache entry.
+        Defaults to *False*.
+    :arg specialize: If *True*, generate a wrapper specialized to the
+        positional arity of *function*, which reduces the per-call overhead.
+        As with *use_signature*, passing an argument by position or by keyword
+        yields the same cache entry. Functions with variable or keyword-only
+        arguments use the generic wrapper. May not be combined with
+        *thread_safe* or *use_signature*. Defaults to *False*.
+
+    .. versionchanged:: 2024.1.2
+
+        Added *maxsize*, *thread_safe*, *use_signature* and *specialize*, and
+        support for coroutine functions and for objects without a
+        :attr:`~object.__dict__`.
     """
 
+    if specialize and (thread_safe or use_signature):
+        raise TypeError("memoize_on_first_arg: specialize may not be combined "
+                "with thread_safe or use_signature")
+
+    from inspect import iscoroutinefunction
+
+    if function is None or iscoroutinefunction(function):
+        def memoize_with_options(func):
+            return memoize_on_first_arg(func,
+                    cache_dict_name=cache_dict_name, maxsize=maxsize,
+                    thread_safe=thread_safe, use_signature=use_signature,
+                    specialize=specialize)
+
+        if function is None:
+            return memoize_with_options
+        else:
+            return _memoize_coroutine_function(memoize_with_options, function)
+
     if cache_dict_name is None:
         cache_dict_name = intern(
                 f"_memoize_dic_{function.__module__}{function.__name__}"
                 )
 
+    signature_key_func = (
+            _make_signature_key_func(function, skip_first=True)
+            if use_signature else None)
+
+    def thread_safe_wrapper(obj: T, *args: P.args, **kwargs: P.kwargs) -> R:
+        if signature_key_func is not None:
+            key = signature_key_func(obj, *args, **kwargs)
+        elif kwargs:
+            key = (_HasKwargs, frozenset(kwargs.items())) + args
+        else:
+            key = args
+
+        assert cache_dict_name is not None
+        cache_dict = getattr(obj, cache_dict_name, None)
+        if cache_dict is None:
+            cache_dict = _get_fallback_memoize_cache(obj, cache_dict_name)
+
+        if cache_dict is not None and maxsize is None:
+            # lock-free fast path
+            try:
+                return cache_dict[key]
+            except KeyError:
+                pass
+
+        if cache_dict is None:
+            with _MEMOIZE_LOCK:
+                cache_dict = getattr(obj, cache_dict_name, None)
+                if cache_dict is None:
+                    cache_dict = _get_fallback_memoize_cache(obj, cache_dict_name)
+                if cache_dict is None:
+                    cache_dict = _make_memoize_cache(
+                            maxsize, _memoize_cache_name(function))
+                    _set_memoize_cache(obj, cache_dict_name, cache_dict)
+
+        return _memoize_single_flight(
+                cache_dict, key, lambda: function(obj, *args, **kwargs))
+
     def wrapper(obj: T, *args: P.args, **kwargs: P.kwargs) -> R:
         if kwargs:
             key = (_HasKwargs, frozenset(kwargs.items())) + args
@@ -772,26 +1603,67 @@ def memoize_on_first_arg(
             key = args
 
         assert cache_dict_name is not None
-        try:
-            return getattr(obj, cache_dict_name)[key]
-        except AttributeError:
-            attribute_error = True
-        except KeyError:
-            attribute_error = False
+        # getattr with a default avoids raising AttributeError on every
+        # call for objects with __slots__
+        cache_dict = getattr(obj, cache_dict_name, None)
+        if cache_dict is None:
+            cache_dict = _get_fallback_memoize_cache(obj, cache_dict_name)
+
+        if cache_dict is not None:
+            try:
+                return cache_dict[key]
+            except KeyError:
+                pass
 
         result = function(obj, *args, **kwargs)
-        if attribute_error:
-            object.__setattr__(obj, cache_dict_name, {key: result})
-            return result
-        else:
-            getattr(obj, cache_dict_name)[key] = result
-            return result
+        if cache_dict is None:
+            cache_dict = _make_memoize_cache(
+                    maxsize, _memoize_cache_name(function))
+            _set_memoize_cache(obj, cache_dict_name, cache_dict)
+
+        cache_dict[key] = result
+        return result
+
+    def signature_wrapper(obj: T, *args: P.args, **kwargs: P.kwargs) -> R:
+        assert signature_key_func is not None
+        key = signature_key_func(obj, *args, **kwargs)
+
+        assert cache_dict_name is not None
+        cache_dict = getattr(obj, cache_dict_name, None)
+        if cache_dict is None:
+            cache_dict = _get_fallback_memoize_cache(obj, cache_dict_name)
+
+        if cache_dict is not None:
+            try:
+                return cache_dict[key]
+            except KeyError:
+                pass
+
+        result = function(obj, *args, **kwargs)
+        if cache_dict is None:
+            cache_dict = _make_memoize_cache(
+                    maxsize, _memoize_cache_name(function))
+            _set_memoize_cache(obj, cache_dict_name, cache_dict)
+
+        cache_dict[key] = result
+        return result
 
     def clear_cache(obj):
-        object.__delattr__(obj, cache_dict_name)
+        _del_memoize_cache(obj, cache_dict_name)
+
+    specialized_wrapper = (
+            _make_specialized_memoize_wrapper(function, cache_dict_name, maxsize)
+            if specialize else None)
 
     from functools import update_wrapper
-    new_wrapper = update_wrapper(wrapper, function)
+    if thread_safe:
+        new_wrapper = update_wrapper(thread_safe_wrapper, function)
+    elif use_signature:
+        new_wrapper = update_wrapper(signature_wrapper, function)
+    elif specialized_wrapper is not None:
+        new_wrapper = update_wrapper(specialized_wrapper, function)
+    else:
+        new_wrapper = update_wrapper(wrapper, function)
 
     # type-ignore because mypy has a point here, stuffing random attributes
     # into the function's dict is moderately sketchy.
@@ -800,19 +1672,64 @@ def memoize_on_first_arg(
     return new_wrapper
 
 
+@overload
 def memoize_method(
-        method: Callable[Concatenate[T, P], R]
+        method: Callable[Concatenate[T, P], R], *,
+        maxsize: Optional[int] = None,
+        thread_safe: bool = False,
+        use_signature: bool = False,
+        specialize: bool = False
         ) -> Callable[Concatenate[T, P], R]:
+    ...
+
+
+@overload
+def memoize_method(
+        method: None = None, *,
+        maxsize: Optional[int] = None,
+        thread_safe: bool = False,
+        use_signature: bool = False,
+        specialize: bool = False
+        ) -> Callable[
+                [Callable[Concatenate[T, P], R]],
+                Callable[Concatenate[T, P], R]]:
+    ...
+
+
+def memoize_method(
+        method: Optional[Callable[Concatenate[T, P], R]] = None, *,
+        maxsize: Optional[int] = None,
+        thread_safe: bool = False,
+        use_signature: bool = False,
+        specialize: bool = False) -> Any:
     """Supports cache deletion via ``method_name.clear_cache(self)``.
 
+    :arg maxsize: See :func:`memoize_on_first_arg`.
+    :arg thread_safe: See :func:`memoize_on_first_arg`.
+    :arg use_signature: See :func:`memoize_on_first_arg`.
+    :arg specialize: See :func:`memoize_on_first_arg`.
+
     .. versionchanged:: 2021.2
 
         Can memoize methods on classes that do not allow setting attributes
         (e.g. by overwritting ``__setattr__``), e.g. frozen :mod:`dataclasses`.
+
+    .. versionchanged:: 2024.1.2
+
+        Added *maxsize*, *thread_safe*, *use_signature* and *specialize*, and
+        support for classes with :attr:`~object.__slots__`, see
+        :func:`memoize_on_first_arg`.
     """
 
+    if method is None:
+        from functools import partial
+        return partial(memoize_method, maxsize=maxsize, thread_safe=thread_safe,
+                use_signature=use_signature, specialize=specialize)
+
     return memoize_on_first_arg(method,
-            cache_dict_name=intern(f"_memoize_dic_{method.__name__}"))
+            cache_dict_name=intern(f"_memoize_dic_{method.__name__}"),
+            maxsize=maxsize, thread_safe=thread_safe, use_signature=use_signature,
+            specialize=specialize)
 
 
 class keyed_memoize_on_first_arg(Generic[T, P, R]):  # noqa: N801
@@ -842,6 +1759,10 @@ class keyed_memoize_on_first_arg(Generic[T, P, R]):  # noqa: N801
     def __call__(
             self, function: Callable[Concatenate[T, P], R]
             ) -> Callable[Concatenate[T, P], R]:
+        from inspect import iscoroutinefunction
+        if iscoroutinefunction(function):
+            return _memoize_coroutine_function(self, function)
+
         cache_dict_name = self.cache_dict_name
         key = self.key
 
@@ -852,19 +1773,27 @@ class keyed_memoize_on_first_arg(Generic[T, P, R]):  # noqa: N801
             cache_key = key(*args, **kwargs)
 
             assert cache_dict_name is not None
-            try:
-                return getattr(obj, cache_dict_name)[cache_key]
-            except AttributeError:
-                result = function(obj, *args, **kwargs)
-                object.__setattr__(obj, cache_dict_name, {cache_key: result})
-                return result
-            except KeyError:
-                result = function(obj, *args, **kwargs)
-                getattr(obj, cache_dict_name)[cache_key] = result
-                return result
+            cache_dict = getattr(obj, cache_dict_name, None)
+            if cache_dict is None:
+                cache_dict = _get_fallback_memoize_cache(obj, cache_dict_name)
+
+            if cache_dict is not None:
+                try:
+                    return cache_dict[cache_key]
+                except KeyError:
+                    pass
+
+            result = function(obj, *args, **kwargs)
+            if cache_dict is None:
+                cache_dict = _make_memoize_cache(
+                        None, _memoize_cache_name(function))
+                _set_memoize_cache(obj, cache_dict_name, cache_dict)
+
+            cache_dict[cache_key] = result
+            return result
 
         def clear_cache(obj):
-            object.__delattr__(obj, cache_dict_name)
+            _del_memoize_cache(obj, cache_dict_name)
 
         from functools import update_wrapper
         new_wrapper = update_wrapper(wrapper, function)
@@ -893,6 +1822,32 @@ class keyed_memoize_method(keyed_memoize_on_first_arg):  # noqa: N801
         return intern(f"_memoize_dic_{function.__name__}")
 
 
+def _get_memoize_in_dict(container: Any) -> Optional[Dict[Hashable, Any]]:
+    memoize_in_dict = getattr(container, "_pytools_memoize_in_dict", None)
+    if memoize_in_dict is None:
+        memoize_in_dict = _get_fallback_memoize_cache(
+                container, "_pytools_memoize_in_dict")
+    return memoize_in_dict
+
+
+def _make_memoize_in_cache(
+        container: Any, identifier: Hashable, maxsize: Optional[int]) -> Any:
+    """Return the cache for *container* and *identifier*, creating it if it
+    does not exist yet.
+    """
+    memoize_in_dict = _get_memoize_in_dict(container)
+    if memoize_in_dict is None:
+        memoize_in_dict = {}
+        _set_memoize_cache(container, "_pytools_memoize_in_dict", memoize_in_dict)
+
+    try:
+        return memoize_in_dict[identifier]
+    except KeyError:
+        cache_dict = memoize_in_dict[identifier] = \
+                _make_memoize_cache(maxsize, f"memoize_in({identifier!r})")
+        return cache_dict
+
+
 class memoize_in(Generic[P, R]):  # noqa
     """Adds a cache to the function it decorates. The cache is attached
     to *container* and must be uniquely specified by *identifier* (i.e.
@@ -915,19 +1870,61 @@ class memoize_in(Generic[P, R]):  # noqa
         Can now use instances of classes as *container* that do not allow
         setting attributes (e.g. by overwritting ``__setattr__``),
         e.g. frozen :mod:`dataclasses`.
+
+    .. versionchanged:: 2024.1.2
+
+        Added *maxsize* and *thread_safe*. If *maxsize* is not *None*, the
+        cache keeps at most *maxsize* results, discarding the least recently
+        used ones. It only takes effect when the cache for *container* and
+        *identifier* is first created. If *thread_safe* is *True*, concurrent
+        calls that miss the cache for the same arguments wait for a single
+        evaluation of the function. Coroutine functions are supported as in
+        :func:`memoize`.
     """
 
-    def __init__(self, container: Any, identifier: Hashable) -> None:
-        try:
-            memoize_in_dict = container._pytools_memoize_in_dict
-        except AttributeError:
-            memoize_in_dict = {}
-            object.__setattr__(container, "_pytools_memoize_in_dict",
-                    memoize_in_dict)
+    def __init__(self, container: Any, identifier: Hashable,
+            maxsize: Optional[int] = None, thread_safe: bool = False) -> None:
+        self.thread_safe = thread_safe
+        self.maxsize = maxsize
+
+        # Lock-free fast path: memoize_in is instantiated on every call of
+        # the enclosing function, and the cache usually exists already.
+        memoize_in_dict = _get_memoize_in_dict(container)
+        cache_dict = (None if memoize_in_dict is None
+                else memoize_in_dict.get(identifier))
+
+        if cache_dict is None:
+            if thread_safe:
+                with _MEMOIZE_LOCK:
+                    cache_dict = _make_memoize_in_cache(
+                            container, identifier, maxsize)
+            else:
+                cache_dict = _make_memoize_in_cache(
+                        container, identifier, maxsize)
 
-        self.cache_dict = memoize_in_dict.setdefault(identifier, {})
+        self.cache_dict = cache_dict
 
     def __call__(self, inner: Callable[P, R]) -> Callable[P, R]:
+        if _is_coroutine_function(inner):
+            return _memoize_coroutine_function(self, inner)
+
+        if self.thread_safe:
+            @wraps(inner)
+            def thread_safe_new_inner(*args: P.args, **kwargs: P.kwargs) -> R:
+                assert not kwargs
+
+                if self.maxsize is None:
+                    # lock-free fast path
+                    try:
+                        return self.cache_dict[args]
+                    except KeyError:
+                        pass
+
+                return _memoize_single_flight(
+                        self.cache_dict, args, lambda: inner(*args, **kwargs))
+
+            return thread_safe_new_inner    # type: ignore[return-value]
+
         @wraps(inner)
         def new_inner(*args: P.args, **kwargs: P.kwargs) -> R:
             assert not kwargs
@@ -958,17 +1955,27 @@ class keyed_memoize_in(Generic[P, R]):  # noqa
     def __init__(self,
             container: Any, identifier: Hashable,
             key: Callable[P, Hashable]) -> None:
-        try:
-            memoize_in_dict = container._pytools_keyed_memoize_in_dict
-        except AttributeError:
-            memoize_in_dict = {}
-            object.__setattr__(container, "_pytools_keyed_memoize_in_dict",
-                    memoize_in_dict)
+        memoize_in_dict = getattr(
+                container, "_pytools_keyed_memoize_in_dict", None)
+        if memoize_in_dict is None:
+            memoize_in_dict = _get_fallback_memoize_cache(
+                    container, "_pytools_keyed_memoize_in_dict")
+            if memoize_in_dict is None:
+                memoize_in_dict = {}
+                _set_memoize_cache(container, "_pytools_keyed_memoize_in_dict",
+                        memoize_in_dict)
 
-        self.cache_dict = memoize_in_dict.setdefault(identifier, {})
+        try:
+            self.cache_dict = memoize_in_dict[identifier]
+        except KeyError:
+            self.cache_dict = memoize_in_dict[identifier] = \
+                    _make_memoize_cache(None, f"keyed_memoize_in({identifier!r})")
         self.key = key
 
     def __call__(self, inner: Callable[P, R]) -> Callable[P, R]:
+        if _is_coroutine_function(inner):
+            return _memoize_coroutine_function(self, inner)
+
         @wraps(inner)
         def new_inner(*args: P.args, **kwargs: P.kwargs) -> R:
             assert not kwargs
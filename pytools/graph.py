@@ -38,15 +38,31 @@ Graph Algorithms
 
 .. autofunction:: reverse_graph
 .. autofunction:: a_star
+.. autofunction:: find_shortest_path
+.. autofunction:: compute_shortest_distances
+.. autofunction:: find_nearest_goals
 .. autofunction:: compute_sccs
+.. autofunction:: compute_condensation
 .. autoexception:: CycleError
 .. autofunction:: compute_topological_order
+.. autofunction:: compute_topological_levels
+.. autofunction:: compute_critical_path
+.. autofunction:: execute_graph
+.. autoclass:: DynamicTopologicalOrder
 .. autofunction:: compute_transitive_closure
+.. autofunction:: compute_transitive_reduction
+.. autoclass:: ReachabilityIndex
 .. autofunction:: contains_cycle
 .. autofunction:: compute_induced_subgraph
 .. autofunction:: as_graphviz_dot
 .. autofunction:: validate_graph
 .. autofunction:: is_connected
+.. autofunction:: compute_connected_components
+
+Compact Graphs
+--------------
+
+.. autoclass:: CompactGraph
 
 Type Variables Used
 -------------------
@@ -64,9 +80,11 @@ Type Variables Used
     is included as a key in the graph.
 """
 
+from array import array
 from typing import (
-    Any, Callable, Collection, Dict, Hashable, Iterator, List, Mapping, MutableSet,
-    Optional, Set, Tuple, TypeVar)
+    TYPE_CHECKING, Any, Callable, Collection, Dict, FrozenSet, Generic, Hashable,
+    Iterable, Iterator, List, Mapping, MutableSet, Optional, Sequence, Set, Tuple,
+    TypeVar)
 
 
 try:
@@ -74,6 +92,9 @@ try:
 except ImportError:
     from typing_extensions import TypeAlias
 
+if TYPE_CHECKING:
+    from concurrent.futures import Executor, Future
+
 
 NodeT = TypeVar("NodeT", bound=Hashable)
 
@@ -81,14 +102,153 @@ NodeT = TypeVar("NodeT", bound=Hashable)
 GraphT: TypeAlias[NodeT] = Mapping[NodeT, Collection[NodeT]]
 
 
+# {{{ compact graph
+
+class CompactGraph(Mapping[NodeT, Tuple[NodeT, ...]]):
+    """An immutable directed graph with nodes numbered ``0, ..., n-1`` and its
+    edges stored in compressed sparse row (CSR) format.
+
+    Since this is a :class:`collections.abc.Mapping` from nodes to tuples of
+    their successors, it can be used wherever a :class:`GraphT` is accepted.
+    :func:`compute_topological_order`, :func:`compute_sccs`,
+    :func:`reverse_graph` and :func:`is_connected` operate directly on the
+    integer indices. Compared to a :class:`dict` mapping nodes to
+    :class:`set` objects, this uses considerably less memory for large graphs.
+
+    .. attribute:: nodes
+
+        A :class:`tuple` of the nodes, in the order of their indices.
+
+    .. attribute:: node_to_index
+
+        A :class:`dict` mapping each node to its index.
+
+    .. attribute:: offsets
+
+        An :class:`array.array` of length ``len(nodes)+1``. The indices of
+        the successors of node *i* are ``targets[offsets[i]:offsets[i+1]]``.
+
+    .. attribute:: targets
+
+        An :class:`array.array` of the indices of the successors of all
+        nodes.
+
+    .. automethod:: from_graph
+    .. automethod:: to_graph
+    .. automethod:: successor_indices
+    .. attribute:: num_edges
+
+    .. versionadded:: 2024.1.2
+    """
+
+    def __init__(self,
+            nodes: Iterable[NodeT],
+            offsets: Iterable[int],
+            targets: Iterable[int]) -> None:
+        self.nodes = tuple(nodes)
+        self.node_to_index = {node: i for i, node in enumerate(self.nodes)}
+        self.offsets = array("q", offsets)
+        self.targets = array("q", targets)
+
+        if len(self.node_to_index) != len(self.nodes):
+            raise ValueError("nodes must be unique")
+        if len(self.offsets) != len(self.nodes) + 1:
+            raise ValueError("offsets must have one more entry than nodes")
+
+    @classmethod
+    def from_graph(cls, graph: GraphT[NodeT]) -> CompactGraph[NodeT]:
+        """Return a :class:`CompactGraph` with the nodes and edges of *graph*.
+        Nodes are numbered in the iteration order of *graph*. Every successor
+        node must also be a key of *graph*.
+        """
+        if isinstance(graph, CompactGraph):
+            return graph
+
+        nodes = list(graph)
+        node_to_index = {node: i for i, node in enumerate(nodes)}
+
+        offsets = array("q", [0])
+        targets = array("q")
+        try:
+            for successors in graph.values():
+                targets.extend(node_to_index[succ] for succ in successors)
+                offsets.append(len(targets))
+        except KeyError as err:
+            raise ValueError(
+                    f"invalid graph, missing key: {err.args[0]!r}") from None
+
+        return cls(nodes, offsets, targets)
+
+    def to_graph(self) -> Dict[NodeT, FrozenSet[NodeT]]:
+        """Return a :class:`dict` mapping each node to a :class:`frozenset` of
+        its successors.
+        """
+        return {node: frozenset(self[node]) for node in self.nodes}
+
+    def successor_indices(self, index: int) -> array[int]:
+        """Return the indices of the successors of the node with index
+        *index*.
+        """
+        return self.targets[self.offsets[index]:self.offsets[index + 1]]
+
+    @property
+    def num_edges(self) -> int:
+        return len(self.targets)
+
+    def __getitem__(self, node: NodeT) -> Tuple[NodeT, ...]:
+        nodes = self.nodes
+        return tuple(
+                nodes[i] for i in self.successor_indices(self.node_to_index[node]))
+
+    def __iter__(self) -> Iterator[NodeT]:
+        return iter(self.nodes)
+
+    def __len__(self) -> int:
+        return len(self.nodes)
+
+    def __contains__(self, node: object) -> bool:
+        return node in self.node_to_index
+
+    def __repr__(self) -> str:
+        return (f"{type(self).__name__}(nnodes={len(self.nodes)}, "
+                f"nedges={len(self.targets)})")
+
+
+def _reverse_compact_graph(graph: CompactGraph[NodeT]) -> CompactGraph[NodeT]:
+    nnodes = len(graph.nodes)
+    offsets = graph.offsets
+    targets = graph.targets
+
+    rev_offsets = [0] * (nnodes + 1)
+    for target in targets:
+        rev_offsets[target + 1] += 1
+    for i in range(nnodes):
+        rev_offsets[i + 1] += rev_offsets[i]
+
+    rev_targets = array("q", bytes(8 * len(targets)))
+    fill = rev_offsets[:-1]
+    for source in range(nnodes):
+        for target in targets[offsets[source]:offsets[source + 1]]:
+            rev_targets[fill[target]] = source
+            fill[target] += 1
+
+    return CompactGraph(graph.nodes, rev_offsets, rev_targets)
+
+# }}}
+
+
 # {{{ reverse_graph
 
 def reverse_graph(graph: GraphT[NodeT]) -> GraphT[NodeT]:
     """
     Reverses a graph *graph*.
 
-    :returns: A :class:`dict` representing *graph* with edges reversed.
+    :returns: A :class:`dict` representing *graph* with edges reversed,
+        or a :class:`CompactGraph` if *graph* is one.
     """
+    if isinstance(graph, CompactGraph):
+        return _reverse_compact_graph(graph)
+
     result: Dict[NodeT, Set[NodeT]] = {}
 
     for node_key, successor_nodes in graph.items():
@@ -103,19 +263,293 @@ def reverse_graph(graph: GraphT[NodeT]) -> GraphT[NodeT]:
 # }}}
 
 
-# {{{ a_star
+# {{{ shortest paths
+
+def _best_first_search(
+        graph: GraphT[NodeT], source: NodeT,
+        step_cost: Callable[[NodeT, NodeT], float],
+        estimate_remaining_cost: Optional[Callable[[NodeT], float]],
+        distances: Dict[NodeT, float],
+        parents: Dict[NodeT, Optional[NodeT]]) -> Iterator[NodeT]:
+    """Yield the nodes reachable from *source* in order of increasing
+    distance (plus estimated remaining cost, if given), using Dijkstra's
+    algorithm, or A* if *estimate_remaining_cost* is given. Outdated heap
+    entries are skipped when popped instead of being updated in place.
+
+    When a node is yielded, *distances* contains its distance from *source*
+    and *parents* its predecessor on a shortest path. Both also contain
+    tentative entries for nodes that have not been yielded yet.
+    """
+    from heapq import heappop, heappush
+    from itertools import count
+
+    inf = float("inf")
+
+    # The counter keeps the nodes themselves from being compared.
+    entry_counter = count()
 
-def a_star(  # pylint: disable=too-many-locals
+    if estimate_remaining_cost is None:
+        priority: float = 0
+    else:
+        priority = estimate_remaining_cost(source)
+        if priority == inf:
+            return
+
+    distances[source] = 0
+    parents[source] = None
+    heap = [(priority, next(entry_counter), source)]
+    settled = set()
+
+    while heap:
+        _, _, node = heappop(heap)
+        if node in settled:
+            continue
+        settled.add(node)
+
+        yield node
+
+        node_distance = distances[node]
+        for successor in graph.get(node, ()):
+            if successor in settled:
+                continue
+
+            if estimate_remaining_cost is None:
+                remaining_cost: float = 0
+            else:
+                remaining_cost = estimate_remaining_cost(successor)
+                if remaining_cost == inf:
+                    continue
+
+            successor_distance = node_distance + step_cost(node, successor)
+            if successor_distance < distances.get(successor, inf):
+                distances[successor] = successor_distance
+                parents[successor] = node
+                heappush(heap, (
+                    successor_distance + remaining_cost,
+                    next(entry_counter),
+                    successor))
+
+
+def _unit_step_cost(node: Any, successor: Any) -> float:
+    return 1
+
+
+def _get_path(
+        parents: Mapping[NodeT, Optional[NodeT]], node: NodeT) -> List[NodeT]:
+    path = []
+    it: Optional[NodeT] = node
+    while it is not None:
+        path.append(it)
+        it = parents[it]
+    return path[::-1]
+
+
+def compute_shortest_distances(
+        graph: GraphT[NodeT], source: NodeT,
+        step_cost: Optional[Callable[[NodeT, NodeT], float]] = None
+        ) -> Tuple[Dict[NodeT, float], Dict[NodeT, Optional[NodeT]]]:
+    """Compute the lengths of shortest paths from *source* to all nodes
+    reachable from it, using Dijkstra's algorithm.
+
+    :arg step_cost: A function returning the non-negative cost of the edge
+        between its two arguments. Defaults to a cost of 1 for each edge.
+
+    :returns: A tuple ``(distances, parents)`` of :class:`dict` objects.
+        *distances* maps each node reachable from *source* to the length of a
+        shortest path to it. *parents* maps each of these nodes to its
+        predecessor on that path, and *source* to *None*.
+
+    .. versionadded:: 2024.1.2
+    """
+    distances: Dict[NodeT, float] = {}
+    parents: Dict[NodeT, Optional[NodeT]] = {}
+
+    for _ in _best_first_search(graph, source,
+            step_cost if step_cost is not None else _unit_step_cost, None,
+            distances, parents):
+        pass
+
+    return distances, parents
+
+
+def find_shortest_path(
+        graph: GraphT[NodeT], source: NodeT, target: NodeT,
+        step_cost: Optional[Callable[[NodeT, NodeT], float]] = None,
+        estimate_remaining_cost: Optional[Callable[[NodeT], float]] = None,
+        bidirectional: bool = False,
+        reversed_graph: Optional[GraphT[NodeT]] = None
+        ) -> Optional[Tuple[float, List[NodeT]]]:
+    """Find a shortest path from *source* to *target*.
+
+    :arg step_cost: See :func:`compute_shortest_distances`.
+    :arg estimate_remaining_cost: If given, use A* with this function as the
+        heuristic. It should return a lower bound on the cost of reaching
+        *target* from its argument that does not decrease by more than the
+        cost of any edge along it (i.e. a consistent heuristic), or
+        :data:`math.inf` to exclude the node.
+    :arg bidirectional: If *True*, search from *source* forward and from
+        *target* backward, alternating between the two, until the searches
+        meet. This usually visits far fewer nodes than a one-sided search.
+        May not be combined with *estimate_remaining_cost*.
+    :arg reversed_graph: For the bidirectional search, the result of
+        :func:`reverse_graph` for *graph*. It is computed if not given.
+
+    :returns: A tuple ``(length, path)``, where *path* is a :class:`list` of
+        nodes from *source* to *target*, or *None* if *target* is not
+        reachable from *source*.
+
+    .. versionadded:: 2024.1.2
+    """
+    if step_cost is None:
+        step_cost = _unit_step_cost
+
+    if not bidirectional:
+        distances: Dict[NodeT, float] = {}
+        parents: Dict[NodeT, Optional[NodeT]] = {}
+        for node in _best_first_search(graph, source, step_cost,
+                estimate_remaining_cost, distances, parents):
+            if node == target:
+                return distances[node], _get_path(parents, node)
+
+        return None
+
+    if estimate_remaining_cost is not None:
+        raise ValueError("bidirectional search does not support "
+                "estimate_remaining_cost")
+
+    if source == target:
+        return 0, [source]
+
+    if reversed_graph is None:
+        reversed_graph = reverse_graph(graph)
+
+    from heapq import heappop, heappush
+    from itertools import count
+
+    inf = float("inf")
+    entry_counter = count()
+
+    # index 0: forward search from source, index 1: backward search from target
+    graphs = (graph, reversed_graph)
+    side_distances: Tuple[Dict[NodeT, float], Dict[NodeT, float]] = (
+            {source: 0}, {target: 0})
+    side_parents: Tuple[Dict[NodeT, Optional[NodeT]], ...] = (
+            {source: None}, {target: None})
+    settled: Tuple[Set[NodeT], Set[NodeT]] = (set(), set())
+    heaps = ([(0., next(entry_counter), source)],
+             [(0., next(entry_counter), target)])
+
+    best_length = inf
+    meeting_node: Optional[NodeT] = None
+
+    while heaps[0] and heaps[1]:
+        if heaps[0][0][0] + heaps[1][0][0] >= best_length:
+            break
+
+        side = 0 if heaps[0][0][0] <= heaps[1][0][0] else 1
+        distances = side_distances[side]
+        other_distances = side_distances[1 - side]
+
+        node_distance, _, node = heappop(heaps[side])
+        if node in settled[side]:
+            continue
+        settled[side].add(node)
+
+        for neighbor in graphs[side].get(node, ()):
+            neighbor_distance = node_distance + (
+                    step_cost(node, neighbor) if side == 0
+                    else step_cost(neighbor, node))
+
+            if neighbor_distance < distances.get(neighbor, inf):
+                distances[neighbor] = neighbor_distance
+                side_parents[side][neighbor] = node
+                heappush(heaps[side],
+                        (neighbor_distance, next(entry_counter), neighbor))
+
+                if neighbor in other_distances:
+                    length = neighbor_distance + other_distances[neighbor]
+                    if length < best_length:
+                        best_length = length
+                        meeting_node = neighbor
+
+    if meeting_node is None:
+        return None
+
+    backward_path = _get_path(side_parents[1], meeting_node)
+    backward_path.reverse()
+    return (best_length,
+            _get_path(side_parents[0], meeting_node) + backward_path[1:])
+
+
+def find_nearest_goals(
+        graph: GraphT[NodeT], source: NodeT, goals: Collection[NodeT],
+        k: int = 1,
+        step_cost: Optional[Callable[[NodeT, NodeT], float]] = None
+        ) -> List[Tuple[float, List[NodeT]]]:
+    """Find shortest paths from *source* to the *k* nodes in *goals* that
+    are nearest to it, stopping the search as soon as they are found.
+
+    :arg goals: A collection of nodes supporting fast membership tests, e.g.
+        a :class:`set`.
+    :arg step_cost: See :func:`compute_shortest_distances`.
+
+    :returns: A :class:`list` of up to *k* tuples ``(length, path)`` as
+        returned by :func:`find_shortest_path`, in order of increasing
+        *length*. It is shorter than *k* if fewer goals are reachable.
+
+    .. versionadded:: 2024.1.2
+    """
+    result: List[Tuple[float, List[NodeT]]] = []
+    if k <= 0:
+        return result
+
+    distances: Dict[NodeT, float] = {}
+    parents: Dict[NodeT, Optional[NodeT]] = {}
+
+    for node in _best_first_search(graph, source,
+            step_cost if step_cost is not None else _unit_step_cost, None,
+            distances, parents):
+        if node in goals:
+            result.append((distances[node], _get_path(parents, node)))
+            if len(result) == k:
+                break
+
+    return result
+
+
+class _AStarNode:
+    __slots__ = ["state", "parent", "path_cost"]
+
+    def __init__(self, state: Any, parent: Optional[_AStarNode],
+            path_cost: float) -> None:
+        self.state = state
+        self.parent = parent
+        self.path_cost = path_cost
+
+
+def a_star(
         initial_state: NodeT, goal_state: NodeT, neighbor_map: GraphT[NodeT],
         estimate_remaining_cost: Optional[Callable[[NodeT], float]] = None,
         get_step_cost: Callable[[Any, NodeT], float] = lambda x, y: 1
         ) -> List[NodeT]:
     """
     With the default cost and heuristic, this amounts to Dijkstra's algorithm.
-    """
 
-    from heapq import heappop, heappush
+    :arg get_step_cost: A function receiving an object with attributes
+        *state* (the node), *parent* (another such object, or *None*) and
+        *path_cost* (its distance from *initial_state*), as well as the
+        successor node, and returning the cost of the edge between them.
 
+    :returns: A :class:`list` of nodes on a shortest path from
+        *initial_state* to *goal_state*.
+
+    :raises RuntimeError: if there is no such path.
+
+    .. versionchanged:: 2024.1.2
+
+        Each node is expanded at most once. See :func:`find_shortest_path`
+        for a more general interface.
+    """
     if estimate_remaining_cost is None:
         # pylint: disable=function-redefined
         def estimate_remaining_cost(x: NodeT) -> float:
@@ -124,46 +558,26 @@ def a_star(  # pylint: disable=too-many-locals
             else:
                 return 0
 
-    class AStarNode:
-        __slots__ = ["state", "parent", "path_cost"]
+    distances: Dict[NodeT, float] = {}
+    parents: Dict[NodeT, Optional[NodeT]] = {}
+    astar_nodes: Dict[NodeT, _AStarNode] = {}
 
-        def __init__(self, state: NodeT, parent: Any, path_cost: float) -> None:
-            self.state = state
-            self.parent = parent
-            self.path_cost = path_cost
+    def step_cost(node: NodeT, successor: NodeT) -> float:
+        try:
+            astar_node = astar_nodes[node]
+        except KeyError:
+            # The parent was expanded before, so its entry exists.
+            parent = parents[node]
+            astar_node = astar_nodes[node] = _AStarNode(node,
+                    None if parent is None else astar_nodes[parent],
+                    distances[node])
 
-    inf = float("inf")
-    init_remcost = estimate_remaining_cost(initial_state)
-    assert init_remcost != inf
-
-    queue = [(init_remcost, AStarNode(initial_state, parent=None, path_cost=0))]
-    visited_states = set()
-
-    while queue:
-        _, top = heappop(queue)
-        visited_states.add(top.state)
-
-        if top.state == goal_state:
-            result = []
-            it: Optional[AStarNode] = top
-            while it is not None:
-                result.append(it.state)
-                it = it.parent
-            return result[::-1]
-
-        for state in neighbor_map[top.state]:
-            if state in visited_states:
-                continue
-
-            remaining_cost = estimate_remaining_cost(state)
-            if remaining_cost == inf:
-                continue
-            step_cost = get_step_cost(top, state)
+        return get_step_cost(astar_node, successor)
 
-            estimated_path_cost = top.path_cost+step_cost+remaining_cost
-            heappush(queue,
-                (estimated_path_cost,
-                    AStarNode(state, top, path_cost=top.path_cost + step_cost)))
+    for node in _best_first_search(neighbor_map, initial_state, step_cost,
+            estimate_remaining_cost, distances, parents):
+        if node == goal_state:
+            return _get_path(parents, node)
 
     raise RuntimeError("no solution")
 
@@ -172,62 +586,148 @@ def a_star(  # pylint: disable=too-many-locals
 
 # {{{ compute SCCs with Tarjan's algorithm
 
-def compute_sccs(graph: GraphT[NodeT]) -> List[List[NodeT]]:
-    to_search = set(graph.keys())
-    visit_order: Dict[NodeT, int] = {}
-    scc_root = {}
+def _compute_scc_indices(
+        offsets: Sequence[int], targets: Sequence[int]) -> List[List[int]]:
+    """Tarjan's algorithm on a graph in CSR format (see :class:`CompactGraph`),
+    starting depth-first searches at nodes in the order of their indices.
+    """
+    nnodes = len(offsets) - 1
+
+    visit_order = [-1] * nnodes
+    scc_root = [0] * nnodes
+    visiting = [False] * nnodes
+    # position in targets of the next edge to visit for each node
+    next_edge = list(offsets[:-1])
+    visit_stack: List[int] = []
     sccs = []
+    count = 0
 
-    while to_search:
-        top = next(iter(to_search))
-        call_stack: List[Tuple[NodeT, Iterator[NodeT], Optional[NodeT]]] = [(top,
-                                                                 iter(graph[top]),
-                                                                 None)]
-        visit_stack = []
-        visiting = set()
+    for start in range(nnodes):
+        if visit_order[start] >= 0:
+            continue
 
-        scc: List[NodeT] = []
+        visit_order[start] = scc_root[start] = count
+        count += 1
+        visit_stack.append(start)
+        visiting[start] = True
+        call_stack = [start]
 
         while call_stack:
-            top, children, last_popped_child = call_stack.pop()
-
-            if top not in visiting:
-                # Unvisited: mark as visited, initialize SCC root.
-                count = len(visit_order)
-                visit_stack.append(top)
-                visit_order[top] = count
-                scc_root[top] = count
-                visiting.add(top)
-                to_search.discard(top)
-
-            # Returned from a recursion, update SCC.
-            if last_popped_child is not None:
-                scc_root[top] = min(
-                    scc_root[top],
-                    scc_root[last_popped_child])
-
-            for child in children:
-                if child not in visit_order:
+            top = call_stack[-1]
+            pos = next_edge[top]
+            end = offsets[top + 1]
+
+            while pos < end:
+                child = targets[pos]
+                pos += 1
+
+                if visit_order[child] < 0:
                     # Recurse.
-                    call_stack.append((top, children, child))
-                    call_stack.append((child, iter(graph[child]), None))
+                    next_edge[top] = pos
+                    visit_order[child] = scc_root[child] = count
+                    count += 1
+                    visit_stack.append(child)
+                    visiting[child] = True
+                    call_stack.append(child)
                     break
-                if child in visiting:
-                    scc_root[top] = min(
-                        scc_root[top],
-                        visit_order[child])
+
+                if visiting[child] and visit_order[child] < scc_root[top]:
+                    scc_root[top] = visit_order[child]
             else:
+                call_stack.pop()
+
                 if scc_root[top] == visit_order[top]:
                     scc = []
-                    while visit_stack[-1] != top:
-                        scc.append(visit_stack.pop())
-                    scc.append(visit_stack.pop())
-                    for item in scc:
-                        visiting.remove(item)
+                    while True:
+                        item = visit_stack.pop()
+                        visiting[item] = False
+                        scc.append(item)
+                        if item == top:
+                            break
                     sccs.append(scc)
 
+                # Returned from a recursion, update SCC.
+                if call_stack:
+                    parent = call_stack[-1]
+                    if scc_root[top] < scc_root[parent]:
+                        scc_root[parent] = scc_root[top]
+
     return sccs
 
+
+def compute_sccs(graph: GraphT[NodeT]) -> List[List[NodeT]]:
+    """Compute the strongly connected components of *graph* using Tarjan's
+    algorithm.
+
+    :returns: A :class:`list` of the strongly connected components, each a
+        :class:`list` of nodes. Each component comes after all components
+        reachable from it.
+
+    .. versionchanged:: 2024.1.2
+
+        The graph is converted to a :class:`CompactGraph` (unless it is one
+        already), on which the search runs using integer indices. The
+        result is identical for a graph and its :class:`CompactGraph`, and
+        deterministic given the iteration order of *graph*.
+    """
+    cgraph = CompactGraph.from_graph(graph)
+    nodes = cgraph.nodes
+
+    return [[nodes[i] for i in scc]
+            for scc in _compute_scc_indices(cgraph.offsets, cgraph.targets)]
+
+
+def compute_condensation(
+        graph: GraphT[NodeT]
+        ) -> Tuple[Dict[NodeT, int], Dict[int, FrozenSet[int]]]:
+    """Compute the condensation of *graph*, i.e. the directed acyclic graph
+    obtained by contracting each strongly connected component to a single
+    node.
+
+    This allows running algorithms that require acyclic graphs, such as
+    :func:`compute_topological_order`, on the components of a graph that
+    may contain cycles.
+
+    :returns: A tuple ``(node_to_component, component_graph)``.
+        *node_to_component* maps each node to the number of its strongly
+        connected component. *component_graph* maps each component number
+        to a :class:`frozenset` of the numbers of the components to which
+        there is an edge from it, excluding itself. Components are numbered
+        ``0, ..., ncomponents-1`` in a topological order of *component_graph*.
+
+    .. versionadded:: 2024.1.2
+    """
+    cgraph = CompactGraph.from_graph(graph)
+    nodes = cgraph.nodes
+    offsets = cgraph.offsets
+    targets = cgraph.targets
+
+    sccs = _compute_scc_indices(offsets, targets)
+    ncomponents = len(sccs)
+
+    # _compute_scc_indices returns components in reverse topological order.
+    index_to_component = [0] * len(nodes)
+    for iscc, scc in enumerate(sccs):
+        component = ncomponents - 1 - iscc
+        for i in scc:
+            index_to_component[i] = component
+
+    component_successors: List[Set[int]] = [set() for _ in range(ncomponents)]
+    for source, component in enumerate(index_to_component):
+        successors = component_successors[component]
+        for target in targets[offsets[source]:offsets[source + 1]]:
+            successors.add(index_to_component[target])
+
+    for component, successors in enumerate(component_successors):
+        successors.discard(component)
+
+    node_to_component = dict(zip(nodes, index_to_component))
+    component_graph = {
+            component: frozenset(successors)
+            for component, successors in enumerate(component_successors)}
+
+    return node_to_component, component_graph
+
 # }}}
 
 
@@ -277,7 +777,15 @@ def compute_topological_order(graph: GraphT[NodeT],
         * Implements `Kahn's algorithm <https://w.wiki/YDy>`__.
 
     .. versionadded:: 2020.2
+
+    .. versionchanged:: 2024.1.2
+
+        Added a fast path for :class:`CompactGraph`, on which ties between
+        equal keys are broken by node index.
     """
+    if isinstance(graph, CompactGraph):
+        return _compute_compact_topological_order(graph, key)
+
     # all nodes have the same keys when not provided
     keyfunc = key if key is not None else (lambda x: 0)
 
@@ -325,6 +833,446 @@ def compute_topological_order(graph: GraphT[NodeT],
 
     return order
 
+
+def _compute_compact_topological_order(
+        graph: CompactGraph[NodeT],
+        key: Optional[Callable[[NodeT], Any]]) -> List[NodeT]:
+    from heapq import heappop, heappush
+
+    nodes = graph.nodes
+    offsets = graph.offsets
+    targets = graph.targets
+    nnodes = len(nodes)
+
+    num_predecessors = [0] * nnodes
+    for target in targets:
+        num_predecessors[target] += 1
+
+    order = []
+
+    if key is None:
+        # Sorted, so already a heap.
+        heap = [i for i in range(nnodes) if num_predecessors[i] == 0]
+
+        while heap:
+            index = heappop(heap)
+            order.append(index)
+
+            for child in targets[offsets[index]:offsets[index + 1]]:
+                num_predecessors[child] -= 1
+                if num_predecessors[child] == 0:
+                    heappush(heap, child)
+    else:
+        from heapq import heapify
+        key_heap = [(key(nodes[i]), i)
+                for i in range(nnodes) if num_predecessors[i] == 0]
+        heapify(key_heap)
+
+        while key_heap:
+            _, index = heappop(key_heap)
+            order.append(index)
+
+            for child in targets[offsets[index]:offsets[index + 1]]:
+                num_predecessors[child] -= 1
+                if num_predecessors[child] == 0:
+                    heappush(key_heap, (key(nodes[child]), child))
+
+    if len(order) != nnodes:
+        # any node which has a predecessor left is a part of a cycle
+        raise CycleError(next(nodes[i] for i in range(nnodes)
+            if num_predecessors[i] != 0))
+
+    return [nodes[i] for i in order]
+
+# }}}
+
+
+# {{{ compute topological levels
+
+def compute_topological_levels(graph: GraphT[NodeT]) -> List[List[NodeT]]:
+    """Partition the nodes of a directed acyclic graph into levels, such that
+    the predecessors of each node are all in earlier levels, and each node is
+    in the earliest level for which this holds.
+
+    The nodes within a level are mutually independent, so that the levels
+    describe a schedule in which every node runs as soon as all its
+    predecessors are done, given unlimited parallelism. The number of levels
+    is the length of the longest path in *graph*, counted in nodes.
+
+    :returns: A :class:`list` of levels, each a :class:`list` of nodes.
+        Concatenating the levels results in a topological order.
+
+    :raises CycleError: if *graph* contains a cycle.
+
+    .. note::
+
+        Implements `Kahn's algorithm <https://w.wiki/YDy>`__, processing all
+        nodes without remaining predecessors at once.
+
+    .. versionadded:: 2024.1.2
+    """
+    nodes_to_num_predecessors = {node: 0 for node in graph}
+
+    for node in graph:
+        for child in graph[node]:
+            nodes_to_num_predecessors[child] = (
+                    nodes_to_num_predecessors.get(child, 0) + 1)
+
+    levels = []
+    level = [node for node, num_preds in nodes_to_num_predecessors.items()
+             if num_preds == 0]
+    num_scheduled = 0
+
+    while level:
+        levels.append(level)
+        num_scheduled += len(level)
+
+        next_level = []
+        for node in level:
+            for child in graph.get(node, ()):
+                nodes_to_num_predecessors[child] -= 1
+                if nodes_to_num_predecessors[child] == 0:
+                    next_level.append(child)
+
+        level = next_level
+
+    if num_scheduled != len(nodes_to_num_predecessors):
+        # any node which has a predecessor left is a part of a cycle
+        raise CycleError(next(iter(n for n, num_preds in
+            nodes_to_num_predecessors.items() if num_preds != 0)))
+
+    return levels
+
+
+def compute_critical_path(
+        graph: GraphT[NodeT],
+        weight: Optional[Callable[[NodeT], float]] = None
+        ) -> Tuple[float, List[NodeT]]:
+    """Find a path of maximal total node weight in a directed acyclic graph.
+
+    With *weight* giving the run time of each node, the weight of this
+    critical path is the least possible time to run all nodes in an order
+    respecting the edges, however many workers are available. Dividing the
+    sum of all weights by it therefore bounds the attainable parallel
+    speedup.
+
+    :arg weight: A function returning the non-negative weight of a node.
+        Defaults to a weight of 1 for every node, in which case the critical
+        path is a longest path counted in nodes.
+
+    :returns: A tuple ``(path_weight, path)``, where *path* is a
+        :class:`list` of nodes, each a successor of the one before it.
+        For an empty graph, ``(0, [])`` is returned.
+
+    :raises CycleError: if *graph* contains a cycle.
+
+    .. versionadded:: 2024.1.2
+    """
+    if weight is None:
+        weight = lambda node: 1
+
+    # For each node, the weight of the heaviest path starting at it, and the
+    # next node on that path.
+    path_weight: Dict[NodeT, float] = {}
+    next_node: Dict[NodeT, Optional[NodeT]] = {}
+
+    for node in reversed(compute_topological_order(graph)):
+        best_successor = None
+        best_weight: float = 0
+        for successor in graph.get(node, ()):
+            if best_successor is None or path_weight[successor] > best_weight:
+                best_successor = successor
+                best_weight = path_weight[successor]
+
+        path_weight[node] = weight(node) + best_weight
+        next_node[node] = best_successor
+
+    if not path_weight:
+        return 0, []
+
+    it: Optional[NodeT] = max(path_weight, key=path_weight.__getitem__)
+    assert it is not None
+    total_weight = path_weight[it]
+
+    path = []
+    while it is not None:
+        path.append(it)
+        it = next_node[it]
+
+    return total_weight, path
+
+# }}}
+
+
+# {{{ execute graph
+
+def _run_timed(task: Callable[[NodeT], Any], node: NodeT) -> Tuple[Any, float]:
+    from time import perf_counter
+    start = perf_counter()
+    result = task(node)
+    return result, perf_counter() - start
+
+
+def execute_graph(
+        graph: GraphT[NodeT],
+        task: Callable[[NodeT], Any], *,
+        executor: Optional[Executor] = None,
+        max_workers: Optional[int] = None,
+        key: Optional[Callable[[NodeT], Any]] = None
+        ) -> Tuple[Dict[NodeT, Any], Dict[NodeT, float]]:
+    """Run ``task(node)`` for each node of the directed acyclic graph *graph*
+    on a :class:`concurrent.futures.Executor`, starting each node as soon as
+    all its predecessors have finished. As in
+    :func:`compute_topological_order`, an edge from *a* to *b* means that *a*
+    must run before *b*.
+
+    :arg executor: The executor on which to run the tasks, e.g. a
+        :class:`~concurrent.futures.ThreadPoolExecutor` or a
+        :class:`~concurrent.futures.ProcessPoolExecutor`. For the latter,
+        *task* and the nodes must be picklable. If not given, a
+        :class:`~concurrent.futures.ThreadPoolExecutor` with *max_workers*
+        workers is created and shut down before returning.
+    :arg max_workers: If not *None*, submit at most this many tasks to the
+        executor at once. When set to the number of workers of *executor*,
+        this makes *key* determine which ready node runs next.
+    :arg key: A function of one argument that determines the order in which
+        nodes that are ready at the same time are submitted, least first, as
+        in :func:`compute_topological_order`.
+
+    :returns: A tuple ``(results, durations)`` of two :class:`dict` objects,
+        mapping each node to the return value of *task* and to the time in
+        seconds it took, respectively. *durations* can be passed to
+        :func:`compute_critical_path` as ``durations.__getitem__``.
+
+    :raises CycleError: if *graph* contains a cycle, before running any task.
+
+    If a task raises an exception, no further tasks are submitted, tasks that
+    have not yet started are cancelled, and the exception is re-raised.
+
+    .. versionadded:: 2024.1.2
+    """
+    from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+    from heapq import heapify, heappop, heappush
+    from itertools import count
+
+    # raises CycleError if needed
+    compute_topological_order(graph)
+
+    keyfunc = key if key is not None else (lambda x: 0)
+
+    nodes_to_num_predecessors = {node: 0 for node in graph}
+    for node in graph:
+        for child in graph[node]:
+            nodes_to_num_predecessors[child] = (
+                    nodes_to_num_predecessors.get(child, 0) + 1)
+
+    # The counter breaks ties between equal keys in first-come order, and
+    # keeps the nodes themselves from being compared.
+    entry_counter = count()
+    heap = [(keyfunc(n), next(entry_counter), n)
+            for n, num_preds in nodes_to_num_predecessors.items()
+            if num_preds == 0]
+    heapify(heap)
+
+    own_executor = executor is None
+    if executor is None:
+        executor = ThreadPoolExecutor(max_workers)
+
+    results: Dict[NodeT, Any] = {}
+    durations: Dict[NodeT, float] = {}
+    in_flight: Dict[Future[Tuple[Any, float]], NodeT] = {}
+
+    try:
+        while heap or in_flight:
+            while heap and (max_workers is None or len(in_flight) < max_workers):
+                _, _, node = heappop(heap)
+                in_flight[executor.submit(_run_timed, task, node)] = node
+
+            done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+
+            for future in done:
+                node = in_flight.pop(future)
+                results[node], durations[node] = future.result()
+
+                for child in graph.get(node, ()):
+                    nodes_to_num_predecessors[child] -= 1
+                    if nodes_to_num_predecessors[child] == 0:
+                        heappush(heap,
+                                (keyfunc(child), next(entry_counter), child))
+    finally:
+        for future in in_flight:
+            future.cancel()
+
+        if own_executor:
+            executor.shutdown()
+
+    return results, durations
+
+# }}}
+
+
+# {{{ dynamic topological order
+
+class DynamicTopologicalOrder(Generic[NodeT]):
+    """Maintains a topological order of a directed acyclic graph to which
+    nodes and edges are added one at a time.
+
+    Implements the algorithm of Pearce and Kelly (`A dynamic topological sort
+    algorithm for directed acyclic graphs
+    <https://doi.org/10.1145/1187436.1210590>`__, 2007). Adding an edge that
+    agrees with the current order takes constant time. Otherwise, only the
+    nodes between the two endpoints of the edge in the current order that
+    are reachable from the target or reach the source are visited and
+    reordered.
+
+    .. automethod:: add_node
+    .. automethod:: add_edge
+    .. automethod:: order
+    .. automethod:: position
+    .. automethod:: to_graph
+    .. automethod:: __contains__
+    .. automethod:: __len__
+
+    .. versionadded:: 2024.1.2
+    """
+
+    def __init__(self, graph: Optional[GraphT[NodeT]] = None) -> None:
+        """
+        :arg graph: An optional directed acyclic graph to start from.
+
+        :raises CycleError: if *graph* contains a cycle.
+        """
+        self._successors: Dict[NodeT, Set[NodeT]] = {}
+        self._predecessors: Dict[NodeT, Set[NodeT]] = {}
+        self._position: Dict[NodeT, int] = {}
+        self._order: List[NodeT] = []
+
+        if graph is not None:
+            for node in compute_topological_order(graph):
+                self.add_node(node)
+            for node, successors in graph.items():
+                self._successors[node].update(successors)
+                for successor in successors:
+                    self._predecessors[successor].add(node)
+
+    def __contains__(self, node: object) -> bool:
+        return node in self._position
+
+    def __len__(self) -> int:
+        return len(self._order)
+
+    def add_node(self, node: NodeT) -> None:
+        """Add *node* at the end of the order. Does nothing if *node* is
+        already present.
+        """
+        if node in self._position:
+            return
+
+        self._successors[node] = set()
+        self._predecessors[node] = set()
+        self._position[node] = len(self._order)
+        self._order.append(node)
+
+    def add_edge(self, source: NodeT, target: NodeT) -> None:
+        """Add an edge from *source* to *target*, adding the nodes if they are
+        not present, and update the order.
+
+        :raises CycleError: if the edge would close a cycle. The graph and the
+            order are left unchanged in this case.
+        """
+        if source == target:
+            raise CycleError(source)
+
+        self.add_node(source)
+        self.add_node(target)
+
+        if target in self._successors[source]:
+            return
+
+        position = self._position
+        lower_bound = position[target]
+        upper_bound = position[source]
+
+        if lower_bound < upper_bound:
+            # The edge goes backwards in the current order, so the nodes in
+            # between that are reachable from *target* (forward) or that reach
+            # *source* (backward) need to be reordered.
+            forward = self._visit(target, self._successors,
+                    lambda pos: pos < upper_bound, source)
+            backward = self._visit(source, self._predecessors,
+                    lambda pos: lower_bound < pos, None)
+            self._reorder(forward, backward)
+
+        self._successors[source].add(target)
+        self._predecessors[target].add(source)
+
+    def _visit(self, start: NodeT, neighbors: Dict[NodeT, Set[NodeT]],
+            in_region: Callable[[int], bool],
+            forbidden: Optional[NodeT]) -> List[NodeT]:
+        position = self._position
+
+        visited = {start}
+        result = [start]
+        stack = [start]
+        while stack:
+            node = stack.pop()
+            for neighbor in neighbors[node]:
+                if neighbor == forbidden:
+                    raise CycleError(forbidden)
+                if neighbor not in visited and in_region(position[neighbor]):
+                    visited.add(neighbor)
+                    result.append(neighbor)
+                    stack.append(neighbor)
+
+        return result
+
+    def _reorder(self, forward: List[NodeT], backward: List[NodeT]) -> None:
+        position = self._position
+        order = self._order
+
+        forward.sort(key=position.__getitem__)
+        backward.sort(key=position.__getitem__)
+
+        # Place the nodes that reach the source before those reachable from
+        # the target, keeping the relative order within each group, in the
+        # positions the two groups occupied before.
+        positions = sorted(position[node] for node in forward + backward)
+        for pos, node in zip(positions, backward + forward):
+            position[node] = pos
+            order[pos] = node
+
+    def order(self) -> List[NodeT]:
+        """Return a :class:`list` of all nodes in topological order."""
+        return list(self._order)
+
+    def position(self, node: NodeT) -> int:
+        """Return the index of *node* in :meth:`order`. If *a* must come
+        before *b*, ``position(a) < position(b)``.
+        """
+        return self._position[node]
+
+    def to_graph(self) -> Dict[NodeT, FrozenSet[NodeT]]:
+        """Return the graph as a :class:`dict` mapping each node to a
+        :class:`frozenset` of its successors.
+        """
+        return {node: frozenset(successors)
+                for node, successors in self._successors.items()}
+
+# }}}
+
+
+# {{{ bitset helpers
+
+def _nodes_from_bitset(bitset: int, nodes: List[NodeT]) -> Iterator[NodeT]:
+    """Yield the entries of *nodes* whose indices are set in *bitset*."""
+    # bin() is linear in the number of bits, unlike repeatedly clearing the
+    # lowest set bit, which is linear in the number of bits per set bit.
+    bits = bin(bitset)[:1:-1]
+    i = bits.find("1")
+    while i >= 0:
+        yield nodes[i]
+        i = bits.find("1", i + 1)
+
 # }}}
 
 
@@ -332,8 +1280,7 @@ def compute_topological_order(graph: GraphT[NodeT],
 
 def compute_transitive_closure(
         graph: Mapping[NodeT, MutableSet[NodeT]]) -> GraphT[NodeT]:
-    """Compute the transitive closure of a directed graph using Warshall's
-    algorithm.
+    """Compute the transitive closure of a directed graph.
 
     :arg graph: A :class:`collections.abc.Mapping` representing a directed
         graph. The mapping contains one key representing each node in the
@@ -346,24 +1293,262 @@ def compute_transitive_closure(
         data type.
 
     .. versionadded:: 2020.2
+
+    .. versionchanged:: 2024.1.2
+
+        Uses the strongly connected components of *graph* in reverse
+        topological order, representing the set of nodes reachable from each
+        component as an :class:`int` bitset, instead of Warshall's algorithm.
+        This takes :math:`O(n m / w)` time rather than :math:`O(n^3)`, where
+        :math:`w` is the machine word size.
     """
-    # Warshall's algorithm
+    nodes = list(graph)
+    node_to_index = {node: i for i, node in enumerate(nodes)}
+
+    # compute_sccs returns each component after all components reachable
+    # from it.
+    reachable: List[int] = [0] * len(nodes)
+    for scc in compute_sccs(graph):
+        scc_indices = {node_to_index[node] for node in scc}
+
+        scc_reachable = 0
+        for node in scc:
+            for successor in graph[node]:
+                successor_index = node_to_index[successor]
+                scc_reachable |= 1 << successor_index
+                if successor_index not in scc_indices:
+                    scc_reachable |= reachable[successor_index]
+
+        for index in scc_indices:
+            reachable[index] = scc_reachable
 
     from copy import deepcopy
     closure = deepcopy(graph)
 
-    # (assumes all graph nodes are included in keys)
-    for k in graph.keys():
-        for n1 in graph.keys():
-            for n2 in graph.keys():
-                if k in closure[n1] and n2 in closure[k]:
-                    closure[n1].add(n2)
+    for node, node_reachable in zip(nodes, reachable):
+        node_closure = closure[node]
+        for successor in _nodes_from_bitset(node_reachable, nodes):
+            node_closure.add(successor)
 
     return closure
 
 # }}}
 
 
+# {{{ compute transitive reduction
+
+def compute_transitive_reduction(
+        graph: GraphT[NodeT]) -> Dict[NodeT, FrozenSet[NodeT]]:
+    """Compute the transitive reduction of a directed acyclic graph, i.e. the
+    graph with the fewest edges that has the same reachability as *graph*.
+    It is obtained by removing every edge from *a* to *b* for which *b* is
+    also reachable from *a* by a longer path.
+
+    Visits the nodes in reverse topological order, keeping the set of
+    nodes reachable from each node as an :class:`int` bitset. The successors
+    of each node are visited closest first, and a successor is dropped if it
+    is reachable from one visited before. This takes :math:`O(n m / w)`
+    time, where :math:`w` is the machine word size.
+
+    :returns: A :class:`dict` mapping each node to a :class:`frozenset` of
+        its successors in the transitive reduction.
+
+    :raises CycleError: if *graph* contains a cycle.
+
+    .. versionadded:: 2024.1.2
+    """
+    order = compute_topological_order(graph)
+    position = {node: i for i, node in enumerate(order)}
+
+    # reachable[i]: bitset of the positions of the nodes reachable from
+    # order[i]
+    reachable = [0] * len(order)
+    result = {}
+
+    for node in reversed(order):
+        node_reachable = 0
+        kept = []
+        for successor_position in sorted(
+                {position[successor] for successor in graph.get(node, ())}):
+            if not node_reachable >> successor_position & 1:
+                kept.append(order[successor_position])
+                node_reachable |= (
+                        1 << successor_position | reachable[successor_position])
+
+        reachable[position[node]] = node_reachable
+        result[node] = frozenset(kept)
+
+    return {node: result[node] for node in graph}
+
+# }}}
+
+
+# {{{ reachability index
+
+class ReachabilityIndex(Generic[NodeT]):
+    """An index for answering repeated reachability queries on a fixed
+    directed graph, without the quadratic memory of
+    :func:`compute_transitive_closure`.
+
+    The index is built on the condensation of the graph (see
+    :func:`compute_condensation`) in linear time and memory. It consists of
+    the topological numbering of the components and of interval labels from
+    a depth-first search: the interval of a component's subtree in the
+    search forest certifies reachability, and an interval enclosing the
+    labels of all of its descendants (as in `GRAIL
+    <https://doi.org/10.14778/1920841.1920879>`__) rules it out. Most
+    :meth:`reachable` queries are answered by these labels in constant time.
+    The rest fall back to a depth-first search pruned by the same labels.
+
+    As in :func:`compute_transitive_closure`, a node is reachable from itself
+    only if it lies on a cycle.
+
+    .. automethod:: reachable
+    .. automethod:: descendants
+    .. automethod:: ancestors
+
+    .. versionadded:: 2024.1.2
+    """
+
+    def __init__(self, graph: GraphT[NodeT]) -> None:
+        node_to_component, component_graph = compute_condensation(graph)
+        ncomponents = len(component_graph)
+
+        components: List[List[NodeT]] = [[] for _ in range(ncomponents)]
+        for node, component in node_to_component.items():
+            components[component].append(node)
+
+        successors = [sorted(component_graph[c]) for c in range(ncomponents)]
+        predecessors: List[List[int]] = [[] for _ in range(ncomponents)]
+        for component, component_successors in enumerate(successors):
+            for successor in component_successors:
+                predecessors[successor].append(component)
+
+        is_cyclic = [len(nodes) > 1 for nodes in components]
+        for node, component in node_to_component.items():
+            if node in graph[node]:
+                is_cyclic[component] = True
+
+        # {{{ depth-first search intervals
+
+        # The post-order numbers of the subtree of c in the search forest are
+        # subtree_start[c], ..., post_order[c].
+        post_order = [-1] * ncomponents
+        subtree_start = [0] * ncomponents
+        count = 0
+
+        for root in range(ncomponents):
+            if post_order[root] >= 0:
+                continue
+
+            subtree_start[root] = count
+            post_order[root] = -2   # visiting
+            call_stack = [(root, iter(successors[root]))]
+            while call_stack:
+                component, children = call_stack[-1]
+                for child in children:
+                    if post_order[child] == -1:
+                        subtree_start[child] = count
+                        post_order[child] = -2
+                        call_stack.append((child, iter(successors[child])))
+                        break
+                else:
+                    call_stack.pop()
+                    post_order[component] = count
+                    count += 1
+
+        # The post-order numbers of all descendants of c are at least
+        # min_descendant[c]. Components are numbered topologically, so
+        # successors have greater numbers.
+        min_descendant = subtree_start[:]
+        for component in range(ncomponents - 1, -1, -1):
+            for successor in successors[component]:
+                if min_descendant[successor] < min_descendant[component]:
+                    min_descendant[component] = min_descendant[successor]
+
+        # }}}
+
+        self._node_to_component = node_to_component
+        self._components = components
+        self._successors = successors
+        self._predecessors = predecessors
+        self._is_cyclic = is_cyclic
+        self._post_order = post_order
+        self._subtree_start = subtree_start
+        self._min_descendant = min_descendant
+
+    def _component_reachable(self, source: int, target: int) -> bool:
+        if source == target:
+            return self._is_cyclic[source]
+
+        # Edges go from lesser to greater component numbers.
+        if source > target:
+            return False
+
+        post_order = self._post_order
+        subtree_start = self._subtree_start
+        min_descendant = self._min_descendant
+
+        target_post = post_order[target]
+        target_min = min_descendant[target]
+
+        stack = [source]
+        visited = {source}
+        while stack:
+            component = stack.pop()
+
+            # target is in the subtree of component in the search forest
+            if subtree_start[component] <= target_post <= post_order[component]:
+                return True
+
+            for successor in self._successors[component]:
+                if (successor not in visited
+                        and successor <= target
+                        # all descendants of target must be descendants of
+                        # successor
+                        and min_descendant[successor] <= target_min
+                        and target_post <= post_order[successor]):
+                    visited.add(successor)
+                    stack.append(successor)
+
+        return False
+
+    def reachable(self, source: NodeT, target: NodeT) -> bool:
+        """Return whether there is a path of one or more edges from *source*
+        to *target*.
+        """
+        return self._component_reachable(
+                self._node_to_component[source],
+                self._node_to_component[target])
+
+    def _collect(self, node: NodeT, neighbors: List[List[int]]) -> Set[NodeT]:
+        start = self._node_to_component[node]
+
+        visited = set()
+        stack = list(neighbors[start])
+        while stack:
+            component = stack.pop()
+            if component not in visited:
+                visited.add(component)
+                stack.extend(neighbors[component])
+
+        if self._is_cyclic[start]:
+            visited.add(start)
+
+        return {node for component in visited
+                for node in self._components[component]}
+
+    def descendants(self, node: NodeT) -> Set[NodeT]:
+        """Return the :class:`set` of nodes reachable from *node*."""
+        return self._collect(node, self._successors)
+
+    def ancestors(self, node: NodeT) -> Set[NodeT]:
+        """Return the :class:`set` of nodes from which *node* is reachable."""
+        return self._collect(node, self._predecessors)
+
+# }}}
+
+
 # {{{ check for cycle
 
 def contains_cycle(graph: GraphT[NodeT]) -> bool:
@@ -489,7 +1674,76 @@ def validate_graph(graph: GraphT[NodeT]) -> None:
 # }}}
 
 
-# {{{
+# {{{ connected components
+
+def _compute_component_labels(
+        nnodes: int, successor_indices: Iterable[Iterable[int]]) -> List[int]:
+    """Label the connected components of a graph with nodes ``0, ...,
+    nnodes-1``, ignoring the edge direction. *successor_indices* yields the
+    indices of the successors of each node, in the order of node indices.
+
+    :returns: A :class:`list` of labels for each node. Components are
+        labeled ``0, 1, ...`` in the order of the least node index they
+        contain.
+    """
+    # Union-find with path halving. Since the lesser root always becomes the
+    # parent, each node has a greater index than its parent, and each
+    # component's root is its least index.
+    parent = list(range(nnodes))
+
+    for source, successors in enumerate(successor_indices):
+        for target in successors:
+            while parent[source] != source:
+                parent[source] = source = parent[parent[source]]
+            while parent[target] != target:
+                parent[target] = target = parent[parent[target]]
+
+            if target < source:
+                parent[source] = target
+            elif source < target:
+                parent[target] = source
+
+    # Relabel in place: the parent of each non-root node has been relabeled
+    # before it.
+    labels = parent
+    nlabels = 0
+    for i, parent_i in enumerate(parent):
+        if parent_i == i:
+            labels[i] = nlabels
+            nlabels += 1
+        else:
+            labels[i] = labels[parent_i]
+
+    return labels
+
+
+def compute_connected_components(graph: GraphT[NodeT]) -> Dict[NodeT, int]:
+    """Label the connected components of *graph*, ignoring the edge
+    direction.
+
+    Uses a union-find data structure, in one pass over the edges and without
+    building an undirected copy of *graph*.
+
+    :returns: A :class:`dict` mapping each node to the label of its
+        component. The components are labeled ``0, 1, ...`` in the order in
+        which their first nodes appear in *graph*.
+
+    .. versionadded:: 2024.1.2
+    """
+    if isinstance(graph, CompactGraph):
+        offsets = graph.offsets
+        targets = graph.targets
+        labels = _compute_component_labels(len(graph.nodes), (
+            targets[offsets[i]:offsets[i + 1]] for i in range(len(graph.nodes))))
+        return dict(zip(graph.nodes, labels))
+
+    node_to_index = {node: i for i, node in enumerate(graph)}
+    labels = _compute_component_labels(len(node_to_index), (
+        map(node_to_index.__getitem__, successors)
+        for successors in graph.values()))
+
+    return dict(zip(node_to_index, labels))
+
 
 def is_connected(graph: GraphT[NodeT]) -> bool:
     """
@@ -497,28 +1751,19 @@ def is_connected(graph: GraphT[NodeT]) -> bool:
     the edge direction.
 
     :returns: A :class:`bool` indicating whether the graph is connected.
+
+    .. versionchanged:: 2024.1.2
+
+        No longer recurses, so that long paths do not exceed the recursion
+        limit. See also :func:`compute_connected_components`.
     """
     if not graph:
         # https://cs.stackexchange.com/questions/52815/is-a-graph-of-zero-nodes-vertices-connected
         return True
 
-    visited = set()
-
-    undirected_graph = {node: set(children) for node, children in graph.items()}
-
-    for node, children in graph.items():
-        for child in children:
-            undirected_graph[child].add(node)
-
-    def dfs(node: NodeT) -> None:
-        visited.add(node)
-        for child in undirected_graph[node]:
-            if child not in visited:
-                dfs(child)
+    return max(compute_connected_components(graph).values()) == 0
 
-    dfs(next(iter(graph.keys())))
-
-    return visited == graph.keys()
+# }}}
 
 
 # vim: foldmethod=marker
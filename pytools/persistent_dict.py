@@ -67,6 +67,8 @@ This module also provides a disk-backed dictionary that uses persistent hashing.
 .. autoclass:: KeyBuilder
 .. autoclass:: PersistentDict
 .. autoclass:: WriteOncePersistentDict
+
+.. autofunction:: persistent_memoize
 """
 
 
@@ -541,8 +543,10 @@ class CollisionWarning(UserWarning):
 
 
 class _PersistentDictBase:
-    def __init__(self, identifier, key_builder=None, container_dir=None):
+    def __init__(self, identifier, key_builder=None, container_dir=None,
+            read_only=False):
         self.identifier = identifier
+        self.read_only = read_only
 
         if key_builder is None:
             key_builder = KeyBuilder()
@@ -571,7 +575,8 @@ class _PersistentDictBase:
 
         self.container_dir = container_dir
 
-        self._make_container_dir()
+        if not self.read_only:
+            self._make_container_dir()
 
     @staticmethod
     def _warn(msg, category=UserWarning, stacklevel=0):
@@ -619,6 +624,10 @@ class _PersistentDictBase:
         from os.path import join
         return join(self._item_dir(hexdigest_key), "contents")
 
+    def _expiry_file(self, hexdigest_key):
+        from os.path import join
+        return join(self._item_dir(hexdigest_key), "expires")
+
     def _lock_file(self, hexdigest_key):
         from os.path import join
         return join(self.container_dir, str(hexdigest_key) + ".lock")
@@ -626,6 +635,58 @@ class _PersistentDictBase:
     def _make_container_dir(self):
         os.makedirs(self.container_dir, exist_ok=True)
 
+    def _check_writable(self, key):
+        if self.read_only:
+            raise ReadOnlyEntryError(key)
+
+    def _fetch_unlocked(self, key, hexdigest_key, _stacklevel=0):
+        """Load the entry for *key* without taking a lock and without
+        modifying the cache directory in any way, even if the entry turns out
+        to be invalid.
+        """
+        item_dir = self._item_dir(hexdigest_key)
+        key_file = self._key_file(hexdigest_key)
+        contents_file = self._contents_file(hexdigest_key)
+
+        # {{{ load key file and do equality check
+
+        try:
+            read_key = self._read(key_file)
+        except FileNotFoundError:
+            logger.debug("%s: disk cache miss [key=%s]",
+                    self.identifier, hexdigest_key)
+            raise NoSuchEntryError(key)
+        except Exception as e:
+            self._warn(f"{type(self).__name__}({self.identifier}) "
+                    f"encountered an invalid key file for key {hexdigest_key}. "
+                    f"Remove the directory '{item_dir}' if necessary. "
+                    f"(caught: {type(e).__name__}: {e})",
+                    stacklevel=1 + _stacklevel)
+            raise NoSuchEntryInvalidKeyError(key)
+
+        self._collision_check(key, read_key, 1 + _stacklevel)
+
+        # }}}
+
+        logger.debug("%s: disk cache hit [key=%s]",
+                self.identifier, hexdigest_key)
+
+        # {{{ load contents
+
+        try:
+            read_contents = self._read(contents_file)
+        except Exception as e:
+            self._warn(f"{type(self).__name__}({self.identifier}) "
+                    f"encountered an invalid contents file for key {hexdigest_key}. "
+                    f"Remove the directory '{item_dir}' if necessary."
+                    f"(caught: {type(e).__name__}: {e})",
+                    stacklevel=1 + _stacklevel)
+            raise NoSuchEntryInvalidContentsError(key)
+
+        # }}}
+
+        return read_contents
+
     def _collision_check(self, key, stored_key, _stacklevel):
         if stored_key != key:
             # Key collision, oh well.
@@ -649,6 +710,10 @@ class _PersistentDictBase:
         self.store(key, value, _stacklevel=1)
 
     def clear(self):
+        if self.read_only:
+            raise ReadOnlyEntryError(
+                    f"cannot clear read-only cache at '{self.container_dir}'")
+
         try:
             shutil.rmtree(self.container_dir)
         except OSError as e:
@@ -657,6 +722,196 @@ class _PersistentDictBase:
 
         self._make_container_dir()
 
+    # {{{ archives
+
+    def _iter_hexdigest_keys(self):
+        from os.path import isdir, join
+
+        if not isdir(self.container_dir):
+            return
+
+        for top in sorted(os.listdir(self.container_dir)):
+            top_dir = join(self.container_dir, top)
+            if len(top) != 3 or not isdir(top_dir):
+                # skip lock files and anything else not created by us
+                continue
+
+            for mid in sorted(os.listdir(top_dir)):
+                mid_dir = join(top_dir, mid)
+                if not isdir(mid_dir):
+                    continue
+
+                for rest in sorted(os.listdir(mid_dir)):
+                    yield top + mid + rest
+
+    def _read_entry_bytes(self, hexdigest_key):
+        """Return a tuple *(key_data, contents_data, expiry_data)* of the
+        on-disk representations of the entry for *hexdigest_key*, or *None* if
+        the entry is incomplete. *expiry_data* is *None* if the entry does not
+        expire.
+        """
+        try:
+            with open(self._key_file(hexdigest_key), "rb") as inf:
+                key_data = inf.read()
+            with open(self._contents_file(hexdigest_key), "rb") as inf:
+                contents_data = inf.read()
+        except FileNotFoundError:
+            return None
+
+        try:
+            with open(self._expiry_file(hexdigest_key), "rb") as inf:
+                expiry_data = inf.read()
+        except FileNotFoundError:
+            expiry_data = None
+
+        return key_data, contents_data, expiry_data
+
+    def _replace_existing_entry(self, item_dir_m, hexdigest_key):
+        raise NotImplementedError()
+
+    def export_archive(self, path, _stacklevel=0):
+        """Write all entries of this dictionary to a single uncompressed
+        :mod:`tarfile` archive at *path*. Entries are stored in their pickled
+        form and are not unpickled in the process.
+
+        :returns: the number of entries written.
+
+        .. versionadded:: 2024.1.2
+        """
+        import tarfile
+        from io import BytesIO
+
+        def add_member(tar, name, data):
+            info = tarfile.TarInfo(name)
+            info.size = len(data)
+            tar.addfile(info, BytesIO(data))
+
+        count = 0
+        with tarfile.open(path, "w") as tar:
+            for hexdigest_key in self._iter_hexdigest_keys():
+                if self.read_only:
+                    entry = self._read_entry_bytes(hexdigest_key)
+                else:
+                    cleanup_m = CleanupManager()
+                    try:
+                        LockManager(cleanup_m, self._lock_file(hexdigest_key),
+                                1 + _stacklevel)
+                        entry = self._read_entry_bytes(hexdigest_key)
+                    finally:
+                        cleanup_m.clean_up()
+
+                if entry is None:
+                    continue
+
+                key_data, contents_data, expiry_data = entry
+                if expiry_data is not None:
+                    add_member(tar, f"{hexdigest_key}/expires", expiry_data)
+                add_member(tar, f"{hexdigest_key}/contents", contents_data)
+                add_member(tar, f"{hexdigest_key}/key", key_data)
+                count += 1
+
+        logger.debug("%s: exported %d entries to '%s'",
+                self.identifier, count, path)
+        return count
+
+    def import_archive(self, path, skip_if_present=True, _stacklevel=0):
+        """Add the entries from an archive written by :meth:`export_archive`
+        to this dictionary. If *skip_if_present* is *True*, entries that
+        already exist are left unchanged. Otherwise, they are overwritten
+        (for :class:`PersistentDict`) or cause :exc:`ReadOnlyEntryError`
+        (for :class:`WriteOncePersistentDict`).
+
+        :returns: the number of entries imported.
+
+        .. versionadded:: 2024.1.2
+        """
+        self._check_writable(path)
+
+        import re
+        import tarfile
+        hexdigest_re = re.compile("[0-9a-f]{7,}")
+
+        def import_entry(hexdigest_key, contents_data, key_data, expiry_data):
+            cleanup_m = CleanupManager()
+            try:
+                try:
+                    LockManager(cleanup_m, self._lock_file(hexdigest_key),
+                            2 + _stacklevel)
+                    item_dir_m = ItemDirManager(
+                            cleanup_m, self._item_dir(hexdigest_key),
+                            delete_on_error=False)
+
+                    if item_dir_m.existed:
+                        if skip_if_present:
+                            return False
+                        self._replace_existing_entry(item_dir_m, hexdigest_key)
+
+                    # only remove what we wrote ourselves
+                    item_dir_m.delete_on_error = True
+                    item_dir_m.mkdir()
+
+                    with open(self._contents_file(hexdigest_key), "wb") as outf:
+                        outf.write(contents_data)
+                    if expiry_data is not None:
+                        with open(self._expiry_file(hexdigest_key), "wb") as outf:
+                            outf.write(expiry_data)
+                    with open(self._key_file(hexdigest_key), "wb") as outf:
+                        outf.write(key_data)
+                except Exception:
+                    cleanup_m.error_clean_up()
+                    raise
+            finally:
+                cleanup_m.clean_up()
+
+            return True
+
+        count = 0
+        pending_contents = {}
+        pending_expiry = {}
+        with tarfile.open(path, "r") as tar:
+            for member in tar:
+                hexdigest_key, _, kind = member.name.partition("/")
+                if (not member.isfile()
+                        or not hexdigest_re.fullmatch(hexdigest_key)
+                        or kind not in ("key", "contents", "expires")):
+                    raise ValueError(
+                            f"'{path}' contains unexpected member '{member.name}'")
+
+                data = tar.extractfile(member).read()
+
+                if kind == "contents":
+                    pending_contents[hexdigest_key] = data
+                elif kind == "expires":
+                    pending_expiry[hexdigest_key] = data
+                else:
+                    try:
+                        contents_data = pending_contents.pop(hexdigest_key)
+                    except KeyError:
+                        raise ValueError(f"'{path}' is missing contents "
+                                f"for key '{hexdigest_key}'") from None
+
+                    if import_entry(hexdigest_key, contents_data, data,
+                            pending_expiry.pop(hexdigest_key, None)):
+                        count += 1
+
+        logger.debug("%s: imported %d entries from '%s'",
+                self.identifier, count, path)
+        return count
+
+    # }}}
+
+
+def _save_hot_set_at_exit(pdict_ref):
+    pdict = pdict_ref()
+    if pdict is None:
+        return
+
+    try:
+        pdict.save_hot_set()
+    except OSError as e:
+        logger.warning("%s: could not save hot set (caught: %s: %s)",
+                pdict.identifier, type(e).__name__, e)
+
 
 class WriteOncePersistentDict(_PersistentDictBase):
     """A concurrent disk-backed dictionary that disallows overwriting/deletion.
@@ -672,20 +927,61 @@ class WriteOncePersistentDict(_PersistentDictBase):
     .. automethod:: store
     .. automethod:: store_if_not_present
     .. automethod:: fetch
+    .. automethod:: export_archive
+    .. automethod:: import_archive
+    .. automethod:: remove_unreferenced_values
+    .. automethod:: prefetch
+    .. automethod:: save_hot_set
     """
     def __init__(self, identifier, key_builder=None, container_dir=None,
-             in_mem_cache_size=256):
+             in_mem_cache_size=256, read_only=False, deduplicate_values=False,
+             hot_set_size=0):
         """
         :arg identifier: a file-name-compatible string identifying this
             dictionary
         :arg key_builder: a subclass of :class:`KeyBuilder`
         :arg in_mem_cache_size: retain an in-memory cache of up to
             *in_mem_cache_size* items
+        :arg read_only: if *True*, never write to *container_dir*. No lock
+            files are created or waited on, and attempts to modify the
+            dictionary raise :exc:`ReadOnlyEntryError`. This is intended for
+            caches shipped on read-only file systems.
+        :arg deduplicate_values: if *True*, values with identical pickled
+            representations are stored only once, in a content-addressed
+            store inside *container_dir*. Each entry's contents file is a hard
+            link to the stored value, so reads are unaffected. Values no
+            longer used by any entry can be removed with
+            :meth:`remove_unreferenced_values`.
+        :arg hot_set_size: if positive, count hits per entry and record the
+            *hot_set_size* most frequently fetched entries in *container_dir*
+            when the interpreter exits (or :meth:`save_hot_set` is called).
+            The hot set recorded by a previous run is loaded into the in-memory
+            cache in the background on construction.
+
+        .. versionchanged:: 2024.1.2
+
+            Added *read_only*, *deduplicate_values* and *hot_set_size*.
         """
-        _PersistentDictBase.__init__(self, identifier, key_builder, container_dir)
+        _PersistentDictBase.__init__(self, identifier, key_builder, container_dir,
+                read_only=read_only)
+        self.deduplicate_values = deduplicate_values
         self._in_mem_cache_size = in_mem_cache_size
         self.clear_in_mem_cache()
 
+        self.hot_set_size = hot_set_size
+        if hot_set_size > 0:
+            from collections import Counter
+            self._hit_counts = Counter()
+
+            self._prefetch_hexdigest_keys(self._load_hot_set(), wait=False)
+
+            if not read_only:
+                import atexit
+                import weakref
+                atexit.register(_save_hot_set_at_exit, weakref.ref(self))
+        else:
+            self._hit_counts = None
+
     def clear_in_mem_cache(self) -> None:
         """
         .. versionadded:: 2023.1.1
@@ -693,6 +989,100 @@ class WriteOncePersistentDict(_PersistentDictBase):
 
         self._cache = _LRUCache(self._in_mem_cache_size)
 
+        # Filled by prefetching threads, drained by fetch on the calling thread
+        # so that the (not thread-safe) LRU cache is only touched from there.
+        # Holds at most in_mem_cache_size entries, dropping the oldest ones.
+        import threading
+        self._prefetched = {}
+        self._prefetched_lock = threading.Lock()
+
+    # {{{ prefetching
+
+    def _hot_set_file(self):
+        from os.path import join
+        return join(self.container_dir, "hot_set")
+
+    def _load_hot_set(self):
+        try:
+            with open(self._hot_set_file()) as inf:
+                return inf.read().split()
+        except OSError:
+            return []
+
+    def save_hot_set(self):
+        """Record the *hot_set_size* most frequently fetched entries of this
+        instance, to be prefetched by future instances. Does nothing if no
+        entries were fetched.
+
+        .. versionadded:: 2024.1.2
+        """
+        if not self._hit_counts:
+            return
+
+        self._check_writable(self._hot_set_file())
+
+        from tempfile import mkstemp
+        fd, tmp_file = mkstemp(dir=self.container_dir, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w") as outf:
+                for hexdigest_key, _ in self._hit_counts.most_common(
+                        self.hot_set_size):
+                    outf.write(f"{hexdigest_key}\n")
+            os.replace(tmp_file, self._hot_set_file())
+        except Exception:
+            os.unlink(tmp_file)
+            raise
+
+    def _prefetch_entry(self, hexdigest_key, prefetched, prefetched_lock):
+        from os.path import exists
+        if exists(self._lock_file(hexdigest_key)):
+            # being written, leave it to fetch
+            return
+
+        try:
+            read_key = self._read(self._key_file(hexdigest_key))
+            read_contents = self._read(self._contents_file(hexdigest_key))
+        except Exception:
+            # Missing or invalid entries are reported by fetch.
+            return
+
+        with prefetched_lock:
+            prefetched[hexdigest_key] = (read_key, read_contents)
+
+            # Drop entries that were prefetched but never fetched.
+            while len(prefetched) > self._in_mem_cache_size:
+                del prefetched[next(iter(prefetched))]
+
+    def _prefetch_hexdigest_keys(self, hexdigest_keys, wait, max_workers=None):
+        hexdigest_keys = [
+                hexdigest_key for hexdigest_key in hexdigest_keys
+                if hexdigest_key not in self._cache
+                ][:self._in_mem_cache_size]
+        if not hexdigest_keys:
+            return
+
+        from concurrent.futures import ThreadPoolExecutor
+        executor = ThreadPoolExecutor(max_workers=max_workers,
+                thread_name_prefix=f"{type(self).__name__}-prefetch")
+        for hexdigest_key in hexdigest_keys:
+            executor.submit(self._prefetch_entry, hexdigest_key,
+                    self._prefetched, self._prefetched_lock)
+        executor.shutdown(wait=wait)
+
+    def prefetch(self, keys, wait=False, max_workers=None):
+        """Load the entries for *keys* into the in-memory cache using a pool of
+        up to *max_workers* threads. Keys without an entry are ignored.
+
+        :arg wait: if *True*, return only after all entries have been loaded.
+
+        .. versionadded:: 2024.1.2
+        """
+        self._prefetch_hexdigest_keys(
+                [self.key_builder(key) for key in keys], wait=wait,
+                max_workers=max_workers)
+
+    # }}}
+
     def _spin_until_removed(self, lock_file, stacklevel):
         from os.path import exists
 
@@ -713,7 +1103,88 @@ class WriteOncePersistentDict(_PersistentDictBase):
                         f"on the lock file '{lock_file}'"
                         "--something is wrong")
 
+    # {{{ value deduplication
+
+    def _values_dir(self):
+        from os.path import join
+        return join(self.container_dir, "values")
+
+    def _write_deduplicated(self, path, value):
+        from os.path import exists, join
+        from pickle import HIGHEST_PROTOCOL, dumps
+
+        data = dumps(value, protocol=HIGHEST_PROTOCOL)
+
+        value_hash = self.key_builder.new_hash()
+        value_hash.update(data)
+        value_digest = value_hash.hexdigest()
+
+        value_dir = join(self._values_dir(), value_digest[:3])
+        value_file = join(value_dir, value_digest[3:])
+
+        if not exists(value_file):
+            os.makedirs(value_dir, exist_ok=True)
+
+            # Write to a temporary file first so that a concurrent writer of the
+            # same value never links to a partially written file.
+            from tempfile import mkstemp
+            fd, tmp_file = mkstemp(dir=value_dir, suffix=".tmp")
+            try:
+                with os.fdopen(fd, "wb") as outf:
+                    outf.write(data)
+                os.replace(tmp_file, value_file)
+            except Exception:
+                os.unlink(tmp_file)
+                raise
+
+        try:
+            os.link(value_file, path)
+        except OSError:
+            # Either the file system does not support hard links, or the
+            # value was just removed by remove_unreferenced_values.
+            with open(path, "wb") as outf:
+                outf.write(data)
+
+    def remove_unreferenced_values(self):
+        """Remove values from the store used by *deduplicate_values* that are
+        no longer referenced by any entry.
+
+        :returns: the number of values removed.
+
+        .. versionadded:: 2024.1.2
+        """
+        self._check_writable(self._values_dir())
+
+        from os.path import isdir, join
+
+        values_dir = self._values_dir()
+        if not isdir(values_dir):
+            return 0
+
+        count = 0
+        for prefix in os.listdir(values_dir):
+            value_dir = join(values_dir, prefix)
+            for name in os.listdir(value_dir):
+                if name.endswith(".tmp"):
+                    continue
+
+                value_file = join(value_dir, name)
+                try:
+                    # The stored value itself accounts for one link.
+                    if os.stat(value_file).st_nlink == 1:
+                        os.unlink(value_file)
+                        count += 1
+                except FileNotFoundError:
+                    pass
+
+        logger.debug("%s: removed %d unreferenced values",
+                self.identifier, count)
+        return count
+
+    # }}}
+
     def store(self, key, value, _skip_if_present=False, _stacklevel=0):
+        self._check_writable(key)
         hexdigest_key = self.key_builder(key)
 
         cleanup_m = CleanupManager()
@@ -735,7 +1206,10 @@ class WriteOncePersistentDict(_PersistentDictBase):
                 key_path = self._key_file(hexdigest_key)
                 value_path = self._contents_file(hexdigest_key)
 
-                self._write(value_path, value)
+                if self.deduplicate_values:
+                    self._write_deduplicated(value_path, value)
+                else:
+                    self._write(value_path, value)
                 self._write(key_path, key)
 
                 logger.debug("%s: disk cache store [key=%s]",
@@ -754,75 +1228,61 @@ class WriteOncePersistentDict(_PersistentDictBase):
         try:
             stored_key, stored_value = self._cache[hexdigest_key]
         except KeyError:
-            pass
+            try:
+                with self._prefetched_lock:
+                    stored_key, stored_value = self._prefetched.pop(hexdigest_key)
+            except KeyError:
+                pass
+            else:
+                logger.debug("%s: prefetched cache hit [key=%s]",
+                        self.identifier, hexdigest_key)
+                self._collision_check(key, stored_key, 1 + _stacklevel)
+                self._cache[hexdigest_key] = (key, stored_value)
+                if self._hit_counts is not None:
+                    self._hit_counts[hexdigest_key] += 1
+                return stored_value
         else:
             logger.debug("%s: in mem cache hit [key=%s]",
                     self.identifier, hexdigest_key)
             self._collision_check(key, stored_key, 1 + _stacklevel)
+            if self._hit_counts is not None:
+                self._hit_counts[hexdigest_key] += 1
             return stored_value
 
         # }}}
 
         # {{{ check path exists and is unlocked
 
-        item_dir = self._item_dir(hexdigest_key)
+        if not self.read_only:
+            item_dir = self._item_dir(hexdigest_key)
 
-        from os.path import isdir
-        if not isdir(item_dir):
-            logger.debug("%s: disk cache miss [key=%s]",
-                    self.identifier, hexdigest_key)
-            raise NoSuchEntryError(key)
+            from os.path import isdir
+            if not isdir(item_dir):
+                logger.debug("%s: disk cache miss [key=%s]",
+                        self.identifier, hexdigest_key)
+                raise NoSuchEntryError(key)
 
-        lock_file = self._lock_file(hexdigest_key)
-        self._spin_until_removed(lock_file, 1 + _stacklevel)
+            lock_file = self._lock_file(hexdigest_key)
+            self._spin_until_removed(lock_file, 1 + _stacklevel)
 
         # }}}
 
-        key_file = self._key_file(hexdigest_key)
-        contents_file = self._contents_file(hexdigest_key)
-
         # Note: Unlike PersistentDict, this doesn't autodelete invalid entires,
         # because that would lead to a race condition.
 
-        # {{{ load key file and do equality check
-
-        try:
-            read_key = self._read(key_file)
-        except Exception as e:
-            self._warn(f"{type(self).__name__}({self.identifier}) "
-                    f"encountered an invalid key file for key {hexdigest_key}. "
-                    f"Remove the directory '{item_dir}' if necessary. "
-                    f"(caught: {type(e).__name__}: {e})",
-                    stacklevel=1 + _stacklevel)
-            raise NoSuchEntryInvalidKeyError(key)
-
-        self._collision_check(key, read_key, 1 + _stacklevel)
-
-        # }}}
-
-        logger.debug("%s: disk cache hit [key=%s]",
-                self.identifier, hexdigest_key)
-
-        # {{{ load contents
-
-        try:
-            read_contents = self._read(contents_file)
-        except Exception as e:
-            self._warn(f"{type(self).__name__}({self.identifier}) "
-                    f"encountered an invalid contents file for key {hexdigest_key}. "
-                    f"Remove the directory '{item_dir}' if necessary."
-                    f"(caught: {type(e).__name__}: {e})",
-                    stacklevel=1 + _stacklevel)
-            raise NoSuchEntryInvalidContentsError(key)
-
-        # }}}
+        read_contents = self._fetch_unlocked(key, hexdigest_key, 1 + _stacklevel)
 
         self._cache[hexdigest_key] = (key, read_contents)
+        if self._hit_counts is not None:
+            self._hit_counts[hexdigest_key] += 1
         return read_contents
 
+    def _replace_existing_entry(self, item_dir_m, hexdigest_key):
+        raise ReadOnlyEntryError(hexdigest_key)
+
     def clear(self):
         _PersistentDictBase.clear(self)
-        self._cache.clear()
+        self.clear_in_mem_cache()
 
 
 class PersistentDict(_PersistentDictBase):
@@ -837,18 +1297,64 @@ class PersistentDict(_PersistentDictBase):
     .. automethod:: store_if_not_present
     .. automethod:: fetch
     .. automethod:: remove
+    .. automethod:: remove_expired
+    .. automethod:: export_archive
+    .. automethod:: import_archive
     """
-    def __init__(self, identifier, key_builder=None, container_dir=None):
+    def __init__(self, identifier, key_builder=None, container_dir=None,
+            read_only=False, ttl=None):
         """
         :arg identifier: a file-name-compatible string identifying this
             dictionary
         :arg key_builder: a subclass of :class:`KeyBuilder`
+        :arg read_only: if *True*, never write to *container_dir*. No lock
+            files are created, invalid entries are reported but not deleted,
+            and attempts to modify the dictionary raise
+            :exc:`ReadOnlyEntryError`.
+        :arg ttl: if not *None*, the default number of seconds after which
+            entries stored by this instance expire. Expired entries are
+            treated as missing by :meth:`fetch` and can be removed in bulk
+            with :meth:`remove_expired`.
+
+        .. versionchanged:: 2024.1.2
+
+            Added *read_only* and *ttl*.
         """
-        _PersistentDictBase.__init__(self, identifier, key_builder, container_dir)
+        _PersistentDictBase.__init__(self, identifier, key_builder, container_dir,
+                read_only=read_only)
+        self.ttl = ttl
 
-    def store(self, key, value, _skip_if_present=False, _stacklevel=0):
+    def _read_expiry(self, hexdigest_key):
+        try:
+            with open(self._expiry_file(hexdigest_key)) as inf:
+                return float(inf.read())
+        except FileNotFoundError:
+            return None
+
+    def _is_expired(self, hexdigest_key):
+        expiry = self._read_expiry(hexdigest_key)
+        if expiry is None:
+            return False
+
+        from time import time
+        return time() >= expiry
+
+    def store(self, key, value, _skip_if_present=False, _stacklevel=0, *,
+            ttl=None):
+        """
+        :arg ttl: the number of seconds after which the entry expires. If
+            *None*, the *ttl* passed to the constructor is used.
+
+        .. versionchanged:: 2024.1.2
+
+            Added *ttl*.
+        """
+        self._check_writable(key)
         hexdigest_key = self.key_builder(key)
 
+        if ttl is None:
+            ttl = self.ttl
+
         cleanup_m = CleanupManager()
         try:
             try:
@@ -859,7 +1365,7 @@ class PersistentDict(_PersistentDictBase):
                         delete_on_error=True)
 
                 if item_dir_m.existed:
-                    if _skip_if_present:
+                    if _skip_if_present and not self._is_expired(hexdigest_key):
                         return
                     item_dir_m.reset()
 
@@ -869,6 +1375,10 @@ class PersistentDict(_PersistentDictBase):
                 value_path = self._contents_file(hexdigest_key)
 
                 self._write(value_path, value)
+                if ttl is not None:
+                    from time import time
+                    with open(self._expiry_file(hexdigest_key), "w") as outf:
+                        outf.write(repr(time() + ttl))
                 self._write(key_path, key)
 
                 logger.debug("%s: cache store [key=%s]",
@@ -879,8 +1389,20 @@ class PersistentDict(_PersistentDictBase):
         finally:
             cleanup_m.clean_up()
 
+    def _replace_existing_entry(self, item_dir_m, hexdigest_key):
+        item_dir_m.reset()
+
     def fetch(self, key, _stacklevel=0):
         hexdigest_key = self.key_builder(key)
+
+        if self.read_only:
+            if self._is_expired(hexdigest_key):
+                logger.debug("%s: cache entry expired [key=%s]",
+                        self.identifier, hexdigest_key)
+                raise NoSuchEntryError(key)
+
+            return self._fetch_unlocked(key, hexdigest_key, 1 + _stacklevel)
+
         item_dir = self._item_dir(hexdigest_key)
 
         from os.path import isdir
@@ -897,6 +1419,12 @@ class PersistentDict(_PersistentDictBase):
                 item_dir_m = ItemDirManager(
                         cleanup_m, item_dir, delete_on_error=False)
 
+                if self._is_expired(hexdigest_key):
+                    item_dir_m.reset()
+                    logger.debug("%s: cache entry expired [key=%s]",
+                            self.identifier, hexdigest_key)
+                    raise NoSuchEntryError(key)
+
                 key_path = self._key_file(hexdigest_key)
                 value_path = self._contents_file(hexdigest_key)
 
@@ -944,6 +1472,7 @@ class PersistentDict(_PersistentDictBase):
             cleanup_m.clean_up()
 
     def remove(self, key, _stacklevel=0):
+        self._check_writable(key)
         hexdigest_key = self.key_builder(key)
 
         item_dir = self._item_dir(hexdigest_key)
@@ -985,9 +1514,177 @@ class PersistentDict(_PersistentDictBase):
         finally:
             cleanup_m.clean_up()
 
+    def remove_expired(self, _stacklevel=0):
+        """Remove all expired entries.
+
+        :returns: the number of entries removed.
+
+        .. versionadded:: 2024.1.2
+        """
+        self._check_writable(self.container_dir)
+
+        count = 0
+        for hexdigest_key in self._iter_hexdigest_keys():
+            if not self._is_expired(hexdigest_key):
+                continue
+
+            cleanup_m = CleanupManager()
+            try:
+                LockManager(cleanup_m, self._lock_file(hexdigest_key),
+                        1 + _stacklevel)
+                item_dir_m = ItemDirManager(
+                        cleanup_m, self._item_dir(hexdigest_key),
+                        delete_on_error=False)
+
+                # re-check under the lock, the entry may have been replaced
+                if self._is_expired(hexdigest_key):
+                    item_dir_m.reset()
+                    count += 1
+            finally:
+                cleanup_m.clean_up()
+
+        logger.debug("%s: removed %d expired entries", self.identifier, count)
+        return count
+
     def __delitem__(self, key):
         self.remove(key, _stacklevel=1)
 
 # }}}
 
+
+# {{{ persistent memoization
+
+def _update_hash_for_value(key_builder, key_hash, value, what):
+    if value is Ellipsis:
+        key_hash.update(b"Ellipsis")
+        return
+
+    try:
+        key_builder.rec(key_hash, value)
+    except TypeError as e:
+        # Not repr(), which may contain the address of the object and would
+        # change the digest on every run.
+        raise TypeError(
+                f"cannot persistently memoize a function with {what} "
+                f"{value!r}: {e}") from e
+
+
+def _update_hash_for_code(key_builder, code_hash, code):
+    code_hash.update(code.co_code)
+    key_builder.rec(code_hash, code.co_names)
+
+    for const in code.co_consts:
+        if isinstance(const, type(code)):
+            _update_hash_for_code(key_builder, code_hash, const)
+        else:
+            # Not repr(), which depends on the hash seed for frozensets.
+            _update_hash_for_value(key_builder, code_hash, const, "constant")
+
+
+def _get_function_digest(key_builder, function):
+    code_hash = key_builder.new_hash()
+    _update_hash_for_code(key_builder, code_hash, function.__code__)
+
+    _update_hash_for_value(key_builder, code_hash, function.__defaults__,
+            "default argument value")
+    kwdefaults = function.__kwdefaults__
+    _update_hash_for_value(key_builder, code_hash,
+            None if kwdefaults is None else tuple(sorted(kwdefaults.items())),
+            "default argument value")
+
+    for cell in function.__closure__ or ():
+        try:
+            contents = cell.cell_contents
+        except ValueError:
+            # The variable is not (yet) assigned in the enclosing scope.
+            code_hash.update(b"<empty cell>")
+        else:
+            _update_hash_for_value(key_builder, code_hash, contents,
+                    "captured variable value")
+
+    return code_hash.hexdigest()
+
+
+def persistent_memoize(function=None, *, identifier=None, key=None,
+        key_builder=None, container_dir=None):
+    """Memoize *function* across interpreter invocations, using a
+    :class:`WriteOncePersistentDict` for storage, with an in-process
+    :class:`dict` in front of it.
+
+    The arguments (or the result of *key*) are hashed using *key_builder*,
+    together with a digest of the function's bytecode, default argument
+    values and the values of variables it captures from enclosing scopes, so
+    that changing the function invalidates the results stored for it. These
+    values must be hashable by *key_builder*, otherwise a :exc:`TypeError` is
+    raised. Changes to functions it calls are not detected. Results must be
+    picklable.
+
+    The decorated function has a ``cache_clear()`` method that removes all
+    results, both in memory and on disk.
+
+    :arg identifier: a file-name-compatible string identifying the cache.
+        Defaults to one derived from the module and qualified name of
+        *function*.
+    :arg key: a function receiving the same arguments as the decorated
+        function which computes and returns the cache key. Defaults to the
+        positional arguments, combined with the keyword arguments if any are
+        given.
+    :arg key_builder: a subclass of :class:`KeyBuilder`.
+    :arg container_dir: passed on to :class:`WriteOncePersistentDict`.
+
+    If *function* is not given, a decorator is returned.
+
+    .. versionadded:: 2024.1.2
+    """
+    if function is None:
+        from functools import partial
+        return partial(persistent_memoize, identifier=identifier, key=key,
+                key_builder=key_builder, container_dir=container_dir)
+
+    if identifier is None:
+        import re
+        identifier = re.sub(r"\W", "_",
+                f"{function.__module__}.{function.__qualname__}")
+
+    pdict = WriteOncePersistentDict(identifier, key_builder=key_builder,
+            container_dir=container_dir, in_mem_cache_size=0)
+
+    code_digest = _get_function_digest(pdict.key_builder, function)
+
+    mem_cache = {}
+
+    def wrapper(*args, **kwargs):
+        if key is not None:
+            cache_key = key(*args, **kwargs)
+        elif kwargs:
+            cache_key = (args, frozenset(kwargs.items()))
+        else:
+            cache_key = args
+
+        try:
+            return mem_cache[cache_key]
+        except KeyError:
+            pass
+
+        try:
+            result = pdict.fetch((code_digest, cache_key))
+        except NoSuchEntryError:
+            result = function(*args, **kwargs)
+            pdict.store_if_not_present((code_digest, cache_key), result)
+
+        mem_cache[cache_key] = result
+        return result
+
+    def cache_clear():
+        mem_cache.clear()
+        pdict.clear()
+
+    from functools import update_wrapper
+    new_wrapper = update_wrapper(wrapper, function)
+    new_wrapper.cache_clear = cache_clear
+
+    return new_wrapper
+
+# }}}
+
 # vim: foldmethod=marker
@@ -48,6 +48,215 @@ def test_compute_sccs():
             verify_sccs(graph, compute_sccs(graph))
 
 
+def test_shortest_paths():
+    import random
+
+    from pytools.graph import (
+        a_star, compute_shortest_distances, find_nearest_goals, find_shortest_path)
+
+    rng = random.Random(0)
+    inf = float("inf")
+
+    nnodes = 40
+    graph = {
+        i: {j for j in range(nnodes) if i != j and rng.random() < 0.08}
+        for i in range(nnodes)}
+    costs = {(i, j): rng.randint(1, 10) for i in graph for j in graph[i]}
+
+    def step_cost(i, j):
+        return costs[i, j]
+
+    def path_cost(path):
+        return sum(costs[i, j] for i, j in zip(path, path[1:]))
+
+    # Bellman-Ford
+    expected = {i: {j: 0 if i == j else inf for j in graph} for i in graph}
+    for _ in range(nnodes):
+        for (i, j), cost in costs.items():
+            for src in graph:
+                expected[src][j] = min(expected[src][j], expected[src][i] + cost)
+
+    for source in graph:
+        distances, parents = compute_shortest_distances(graph, source, step_cost)
+        assert distances == {
+            node: dist for node, dist in expected[source].items() if dist < inf}
+        assert parents[source] is None
+
+        for target in graph:
+            for bidirectional in [False, True]:
+                result = find_shortest_path(graph, source, target, step_cost,
+                        bidirectional=bidirectional)
+                if expected[source][target] == inf:
+                    assert result is None
+                else:
+                    assert result is not None
+                    length, path = result
+                    assert length == expected[source][target] == path_cost(path)
+                    assert path[0] == source and path[-1] == target
+
+        goals = set(rng.sample(range(nnodes), 5))
+        nearest = find_nearest_goals(graph, source, goals, k=3, step_cost=step_cost)
+        assert [length for length, _ in nearest] == sorted(
+            expected[source][goal] for goal in goals
+            if expected[source][goal] < inf)[:3]
+        for length, path in nearest:
+            assert path[-1] in goals and path_cost(path) == length
+
+    # a_star on a grid, with the Manhattan distance as heuristic
+    n = 20
+    grid = {(i, j): {(i + di, j + dj)
+                     for di, dj in [(1, 0), (-1, 0), (0, 1), (0, -1)]
+                     if 0 <= i + di < n and 0 <= j + dj < n}
+            for i in range(n) for j in range(n)}
+    for i in range(1, n):
+        # a wall with a gap at the bottom
+        grid[i, n // 2] = set()
+        for succs in grid.values():
+            succs.discard((i, n // 2))
+
+    expanded = []
+
+    def get_step_cost(astar_node, successor):
+        expanded.append(astar_node.state)
+        return 1
+
+    path = a_star((n - 1, 0), (n - 1, n - 1), grid,
+            lambda node: abs(node[0] - n + 1) + abs(node[1] - n + 1),
+            get_step_cost)
+    assert len(path) == 2 * (n - 1) + n
+    # each node is expanded at most once
+    from collections import Counter
+    assert all(count <= len(grid[node]) for node, count in Counter(expanded).items())
+
+    assert a_star((0, 0), (0, 0), grid) == [(0, 0)]
+    assert len(a_star((0, 0), (0, n - 1), grid)) == n
+    with pytest.raises(RuntimeError):
+        a_star((0, 0), (1, n // 2), grid)
+
+
+def test_transitive_reduction():
+    import random
+
+    from pytools.graph import (
+        CycleError, compute_transitive_closure, compute_transitive_reduction)
+
+    graph = {
+        1: {2, 3, 4},
+        2: {4},
+        3: {4},
+        4: {5},
+        5: set(),
+        }
+
+    assert compute_transitive_reduction(graph) == {
+        1: {2, 3},
+        2: {4},
+        3: {4},
+        4: {5},
+        5: set(),
+        }
+
+    with pytest.raises(CycleError):
+        compute_transitive_reduction({1: {2}, 2: {1}})
+    with pytest.raises(CycleError):
+        compute_transitive_reduction({1: {1}})
+
+    rng = random.Random(0)
+
+    for nnodes in [1, 10, 100]:
+        for edge_prob in [0.02, 0.1, 0.5]:
+            graph = {
+                i: {j for j in range(i + 1, nnodes) if rng.random() < edge_prob}
+                for i in range(nnodes)}
+
+            reduction = compute_transitive_reduction(graph)
+            closure = compute_transitive_closure(graph)
+            assert compute_transitive_closure(
+                {node: set(succs) for node, succs in reduction.items()}) == closure
+
+            for node, succs in reduction.items():
+                assert succs <= graph[node]
+                for succ in succs:
+                    assert not any(succ in closure[other]
+                                   for other in succs if other != succ)
+
+
+def test_reachability_index():
+    import random
+
+    from pytools.graph import (
+        ReachabilityIndex, compute_transitive_closure, reverse_graph)
+
+    rng = random.Random(0)
+
+    for nnodes in [1, 10, 100]:
+        for edge_prob in [0.005, 0.02, 0.05, 0.2]:
+            graph = {
+                i: {j for j in range(nnodes)
+                    if rng.random() < (edge_prob if j > i else edge_prob / 10)}
+                for i in range(nnodes)}
+
+            closure = compute_transitive_closure(graph)
+            reverse_closure = compute_transitive_closure(
+                {node: set(preds) for node, preds in reverse_graph(graph).items()})
+            index = ReachabilityIndex(graph)
+
+            for node in graph:
+                assert index.descendants(node) == closure[node]
+                assert index.ancestors(node) == reverse_closure[node]
+                for other in graph:
+                    assert index.reachable(node, other) == (other in closure[node])
+
+    index = ReachabilityIndex({"a": {"a", "b"}, "b": set()})
+    assert index.reachable("a", "a")
+    assert not index.reachable("b", "b")
+    assert index.descendants("a") == {"a", "b"}
+
+
+def test_compute_condensation():
+    import random
+
+    from pytools.graph import (
+        CompactGraph, compute_condensation, compute_sccs,
+        compute_transitive_closure)
+
+    rng = random.Random(0)
+
+    for nnodes in [1, 10, 100]:
+        for edge_prob in [0.01, 0.05, 0.2]:
+            graph = {
+                i: {j for j in range(nnodes) if rng.random() < edge_prob}
+                for i in range(nnodes)}
+
+            sccs = compute_sccs(graph)
+            assert compute_sccs(CompactGraph.from_graph(graph)) == sccs
+
+            node_to_component, component_graph = compute_condensation(graph)
+            assert set(node_to_component) == set(graph)
+            assert set(component_graph) == set(range(len(sccs)))
+
+            # components are numbered in topological order
+            for component, successors in component_graph.items():
+                assert all(component < succ for succ in successors)
+
+            closure = compute_transitive_closure(graph)
+            for node in graph:
+                for other in graph:
+                    assert (
+                        node_to_component[node] == node_to_component[other]
+                    ) == (node == other
+                          or (other in closure[node] and node in closure[other]))
+
+            expected_component_graph = {
+                component: set() for component in component_graph}
+            for node, succs in graph.items():
+                for succ in succs:
+                    if node_to_component[node] != node_to_component[succ]:
+                        expected_component_graph[node_to_component[node]].add(
+                            node_to_component[succ])
+            assert component_graph == expected_component_graph
+
+
 def test_compute_topological_order():
     from pytools.graph import CycleError, compute_topological_order
 
@@ -79,6 +288,177 @@ def test_compute_topological_order():
         compute_topological_order(cycle)
 
 
+def test_topological_levels():
+    import random
+
+    from pytools.graph import (
+        CycleError, compute_critical_path, compute_topological_levels)
+
+    graph = {
+        "a": {"b", "c"},
+        "b": {"d"},
+        "c": {"d"},
+        "d": set(),
+        "e": {"d"},
+        }
+
+    levels = compute_topological_levels(graph)
+    assert [set(level) for level in levels] == [{"a", "e"}, {"b", "c"}, {"d"}]
+    assert compute_critical_path(graph)[0] == 3
+
+    weights = {"a": 1, "b": 5, "c": 2, "d": 1, "e": 10}
+    assert compute_critical_path(graph, weights.__getitem__) == (11, ["e", "d"])
+    weights["b"] = 10
+    assert compute_critical_path(graph, weights.__getitem__) == (
+        12, ["a", "b", "d"])
+
+    assert compute_topological_levels({}) == []
+    assert compute_critical_path({}) == (0, [])
+
+    with pytest.raises(CycleError):
+        compute_topological_levels({"a": {"b"}, "b": {"a"}})
+    with pytest.raises(CycleError):
+        compute_critical_path({"a": {"b"}, "b": {"a"}})
+
+    rng = random.Random(0)
+    nnodes = 100
+    graph = {
+        i: {j for j in range(i + 1, nnodes) if rng.random() < 0.05}
+        for i in range(nnodes)}
+
+    levels = compute_topological_levels(graph)
+    level_of = {node: ilevel
+                for ilevel, level in enumerate(levels) for node in level}
+    assert len(level_of) == nnodes
+    for node, succs in graph.items():
+        for succ in succs:
+            assert level_of[node] < level_of[succ]
+        if level_of[node] > 0:
+            assert any(level_of[pred] == level_of[node] - 1
+                       for pred in graph if node in graph[pred])
+
+    path_weight, path = compute_critical_path(graph)
+    assert path_weight == len(path) == len(levels)
+    assert all(succ in graph[node] for node, succ in zip(path, path[1:]))
+
+
+def test_execute_graph():
+    import random
+    import threading
+    from concurrent.futures import ProcessPoolExecutor
+
+    from pytools.graph import (
+        CycleError, compute_topological_order, execute_graph)
+
+    rng = random.Random(0)
+    nnodes = 50
+    graph = {
+        i: {j for j in range(i + 1, nnodes) if rng.random() < 0.1}
+        for i in range(nnodes)}
+
+    lock = threading.Lock()
+    finished = set()
+
+    def task(node):
+        with lock:
+            assert all(pred in finished
+                       for pred in graph if node in graph[pred])
+            finished.add(node)
+        return 2 * node
+
+    results, durations = execute_graph(graph, task, max_workers=4)
+    assert results == {node: 2 * node for node in graph}
+    assert set(durations) == set(graph)
+    assert all(duration >= 0 for duration in durations.values())
+
+    # priorities with a single worker
+    order = []
+    execute_graph(graph, order.append, max_workers=1, key=lambda node: -node)
+    assert order == compute_topological_order(graph, key=lambda node: -node)
+
+    # fail fast
+    started = []
+
+    def failing_task(node):
+        started.append(node)
+        if node == 0:
+            raise ZeroDivisionError
+
+    with pytest.raises(ZeroDivisionError):
+        execute_graph({0: {1}, 1: set()}, failing_task)
+    assert started == [0]
+
+    with pytest.raises(CycleError):
+        execute_graph({0: {1}, 1: {0}}, failing_task)
+    assert started == [0]
+
+    with ProcessPoolExecutor(2) as executor:
+        results, _ = execute_graph({-1: {-2}, -2: set()}, abs, executor=executor)
+    assert results == {-1: 1, -2: 2}
+
+
+def test_dynamic_topological_order():
+    import random
+
+    from pytools.graph import CycleError, DynamicTopologicalOrder
+
+    rng = random.Random(0)
+
+    def reaches(graph, source, target):
+        visited = set()
+        stack = [source]
+        while stack:
+            node = stack.pop()
+            if node == target:
+                return True
+            if node not in visited:
+                visited.add(node)
+                stack.extend(graph[node])
+        return False
+
+    nnodes = 60
+    dyn_order = DynamicTopologicalOrder({i: set() for i in range(nnodes)})
+    graph = {i: set() for i in range(nnodes)}
+
+    ncycles = 0
+    for _ in range(600):
+        source, target = rng.randrange(nnodes), rng.randrange(nnodes)
+
+        if reaches(graph, target, source):
+            ncycles += 1
+            order_before = dyn_order.order()
+            with pytest.raises(CycleError):
+                dyn_order.add_edge(source, target)
+            assert dyn_order.order() == order_before
+        else:
+            dyn_order.add_edge(source, target)
+            graph[source].add(target)
+
+        order = dyn_order.order()
+        assert sorted(order) == list(range(nnodes))
+        assert all(dyn_order.position(node) == i for i, node in enumerate(order))
+        assert all(dyn_order.position(node) < dyn_order.position(succ)
+                   for node, succs in graph.items() for succ in succs)
+
+    assert ncycles > 0
+    assert dyn_order.to_graph() == graph
+
+    dyn_order = DynamicTopologicalOrder({"a": {"b"}, "b": set()})
+    dyn_order.add_edge("c", "a")
+    assert dyn_order.order() == ["c", "a", "b"]
+    assert "c" in dyn_order and len(dyn_order) == 3
+    with pytest.raises(CycleError):
+        dyn_order.add_edge("b", "b")
+
+    # a self-loop on a new node does not add the node
+    with pytest.raises(CycleError):
+        dyn_order.add_edge("d", "d")
+    assert "d" not in dyn_order and len(dyn_order) == 3
+
+    with pytest.raises(CycleError):
+        DynamicTopologicalOrder({"a": {"b"}, "b": {"a"}})
+
+
 def test_transitive_closure():
     from pytools.graph import compute_transitive_closure
 
@@ -147,6 +527,49 @@ def test_transitive_closure():
 
     assert closure == expected_closure
 
+    # test with self loop
+    graph = {
+        1: {1, 2},
+        2: set(),
+        }
+
+    expected_closure = {
+        1: {1, 2},
+        2: set(),
+        }
+
+    closure = compute_transitive_closure(graph)
+
+    assert closure == expected_closure
+
+
+def test_transitive_closure_random():
+    import random
+
+    from pytools.graph import compute_transitive_closure
+
+    rng = random.Random(0)
+
+    def reachable_from(graph, node):
+        result = set()
+        stack = list(graph[node])
+        while stack:
+            successor = stack.pop()
+            if successor not in result:
+                result.add(successor)
+                stack.extend(graph[successor])
+        return result
+
+    for nnodes in [1, 10, 100]:
+        for edge_prob in [0.01, 0.05, 0.2]:
+            graph = {
+                i: {j for j in range(nnodes) if rng.random() < edge_prob}
+                for i in range(nnodes)}
+
+            closure = compute_transitive_closure(graph)
+            assert closure == {
+                node: reachable_from(graph, node) for node in graph}
+
 
 def test_graph_cycle_finder():
 
@@ -431,6 +854,102 @@ def test_is_connected():
     assert is_connected({})
 
 
+def test_connected_components():
+    import random
+
+    from pytools.graph import (
+        CompactGraph, compute_connected_components, is_connected)
+
+    # long paths must not exceed the recursion limit
+    nnodes = 5 * sys.getrecursionlimit()
+    chain = {i: {i + 1} for i in range(nnodes - 1)}
+    chain[nnodes - 1] = set()
+    assert is_connected(chain)
+    chain[nnodes // 2] = set()
+    assert not is_connected(chain)
+
+    rng = random.Random(0)
+
+    for nnodes in [1, 10, 100]:
+        for edge_prob in [0.001, 0.01, 0.05]:
+            graph = {
+                i: {j for j in range(nnodes) if rng.random() < edge_prob}
+                for i in range(nnodes)}
+            nodes = list(graph)
+            rng.shuffle(nodes)
+            graph = {node: graph[node] for node in nodes}
+
+            undirected_graph = {node: set(succs) for node, succs in graph.items()}
+            for node, succs in graph.items():
+                for succ in succs:
+                    undirected_graph[succ].add(node)
+
+            expected_labels = {}
+            for node in graph:
+                if node not in expected_labels:
+                    label = len(set(expected_labels.values()))
+                    stack = [node]
+                    while stack:
+                        other = stack.pop()
+                        if other not in expected_labels:
+                            expected_labels[other] = label
+                            stack.extend(undirected_graph[other])
+
+            assert compute_connected_components(graph) == expected_labels
+            assert compute_connected_components(
+                CompactGraph.from_graph(graph)) == expected_labels
+            assert is_connected(graph) == (max(expected_labels.values()) == 0)
+
+
+def test_compact_graph():
+    import random
+
+    from pytools.graph import (
+        CompactGraph, CycleError, compute_sccs, compute_topological_order,
+        is_connected, reverse_graph)
+
+    rng = random.Random(0)
+
+    for nnodes in [1, 10, 100]:
+        for edge_prob in [0.01, 0.05, 0.2]:
+            graph = {
+                i: {j for j in range(nnodes) if rng.random() < edge_prob}
+                for i in range(nnodes)}
+            cgraph = CompactGraph.from_graph(graph)
+
+            assert cgraph.to_graph() == graph
+            assert cgraph.num_edges == sum(len(succs) for succs in graph.values())
+
+            assert reverse_graph(cgraph).to_graph() == reverse_graph(graph)
+            assert is_connected(cgraph) == is_connected(graph)
+            assert (
+                sorted(sorted(scc) for scc in compute_sccs(cgraph))
+                == sorted(sorted(scc) for scc in compute_sccs(graph)))
+
+            dag = {node: {succ for succ in succs if succ > node}
+                   for node, succs in graph.items()}
+            cdag = CompactGraph.from_graph(dag)
+            for key in [None, lambda node: -node]:
+                order = compute_topological_order(cdag, key=key)
+                assert sorted(order) == list(range(nnodes))
+                position = {node: i for i, node in enumerate(order)}
+                assert all(position[node] < position[succ]
+                           for node, succs in dag.items() for succ in succs)
+
+            if any(node in succs for node, succs in graph.items()):
+                with pytest.raises(CycleError):
+                    compute_topological_order(cgraph)
+
+    cgraph = CompactGraph.from_graph({"a": {"b", "c"}, "b": {"c"}, "c": set()})
+    assert compute_topological_order(cgraph) == ["a", "b", "c"]
+    assert set(cgraph["a"]) == {"b", "c"}
+    assert "a" in cgraph and "d" not in cgraph
+    assert len(cgraph) == 3
+
+    with pytest.raises(ValueError):
+        CompactGraph.from_graph({"a": {"b"}})
+
+
 if __name__ == "__main__":
     if len(sys.argv) > 1:
         exec(sys.argv[1])
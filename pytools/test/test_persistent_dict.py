@@ -249,6 +249,49 @@ def test_persistent_dict_clear():
         shutil.rmtree(tmpdir)
 
 
+def test_persistent_dict_ttl():
+    import os
+    try:
+        tmpdir = tempfile.mkdtemp()
+        # Entries that must survive get a large TTL, and a TTL of zero
+        # expires an entry immediately, so that no sleeping is needed.
+        pdict = PersistentDict("pytools-test", container_dir=tmpdir, ttl=1000)
+        expiring_pdict = PersistentDict("pytools-test", container_dir=tmpdir,
+                ttl=0)
+
+        pdict[0] = 0
+        pdict.store(1, 1, ttl=0)
+        expiring_pdict[2] = 2
+        expiring_pdict.store(3, 3, ttl=1000)
+        PersistentDict("pytools-test", container_dir=tmpdir)[4] = 4
+
+        assert pdict[0] == 0
+        assert expiring_pdict[3] == 3
+
+        with pytest.raises(NoSuchEntryError):
+            pdict.fetch(1)
+        # the expired entry was deleted by fetch
+        assert not os.path.exists(pdict._item_dir(pdict.key_builder(1)))
+
+        ro_pdict = PersistentDict("pytools-test", container_dir=tmpdir,
+                read_only=True)
+        with pytest.raises(NoSuchEntryError):
+            ro_pdict.fetch(2)
+
+        assert pdict.remove_expired() == 1
+        assert pdict[0] == 0
+        assert pdict[3] == 3
+        assert pdict[4] == 4
+
+        # expired entries are replaced by store_if_not_present
+        pdict.store(5, 5, ttl=0)
+        pdict.store_if_not_present(5, 6)
+        assert pdict[5] == 6
+
+    finally:
+        shutil.rmtree(tmpdir)
+
+
 @pytest.mark.parametrize("in_mem_cache_size", (0, 256))
 def test_write_once_persistent_dict_storage_and_lookup(in_mem_cache_size):
     try:
@@ -372,6 +415,276 @@ def test_write_once_persistent_dict_clear():
         shutil.rmtree(tmpdir)
 
 
+def test_write_once_persistent_dict_prefetch():
+    try:
+        tmpdir = tempfile.mkdtemp()
+        pdict = WriteOncePersistentDict("pytools-test", container_dir=tmpdir,
+                hot_set_size=2)
+        for i in range(5):
+            pdict[i] = PDictTestingKeyOrValue(i)
+
+        pdict2 = WriteOncePersistentDict("pytools-test", container_dir=tmpdir)
+        pdict2.prefetch([0, 1, 17], wait=True)
+        assert set(pdict2._prefetched) == {
+                pdict2.key_builder(0), pdict2.key_builder(1)}
+        assert pdict2[0] == PDictTestingKeyOrValue(0)
+        assert pdict2.key_builder(0) in pdict2._cache
+        with pytest.raises(NoSuchEntryError):
+            pdict2.fetch(17)
+
+        for i in (3, 3, 3, 4, 4, 0):
+            pdict.fetch(i)
+        pdict.save_hot_set()
+
+        pdict3 = WriteOncePersistentDict("pytools-test", container_dir=tmpdir,
+                hot_set_size=2)
+        assert pdict3._load_hot_set() == [pdict.key_builder(3), pdict.key_builder(4)]
+
+        # wait for the background prefetch to finish
+        from time import sleep
+        for _ in range(100):
+            if len(pdict3._prefetched) == 2:
+                break
+            sleep(0.01)
+
+        assert set(pdict3._prefetched) == {
+                pdict3.key_builder(3), pdict3.key_builder(4)}
+        assert pdict3[3] == PDictTestingKeyOrValue(3)
+
+        # entries prefetched but never fetched do not accumulate
+        pdict4 = WriteOncePersistentDict("pytools-test", container_dir=tmpdir,
+                in_mem_cache_size=2)
+        for i in range(5):
+            pdict4.prefetch([i], wait=True)
+        assert set(pdict4._prefetched) == {
+                pdict4.key_builder(3), pdict4.key_builder(4)}
+
+    finally:
+        shutil.rmtree(tmpdir)
+
+
+def test_write_once_persistent_dict_deduplication():
+    import os
+    try:
+        tmpdir = tempfile.mkdtemp()
+        pdict = WriteOncePersistentDict("pytools-test", container_dir=tmpdir,
+                deduplicate_values=True)
+
+        value = PDictTestingKeyOrValue("x" * 1000)
+        for i in range(5):
+            pdict[i] = value
+        pdict[5] = PDictTestingKeyOrValue("y")
+
+        # one copy of each value in the store, plus one link per entry
+        assert os.stat(pdict._contents_file(pdict.key_builder(0))).st_nlink == 6
+        assert os.stat(pdict._contents_file(pdict.key_builder(5))).st_nlink == 2
+
+        pdict2 = WriteOncePersistentDict("pytools-test", container_dir=tmpdir)
+        for i in range(5):
+            assert pdict2[i] == value
+        assert pdict2[5] == PDictTestingKeyOrValue("y")
+
+        assert pdict.remove_unreferenced_values() == 0
+
+        shutil.rmtree(pdict._item_dir(pdict.key_builder(5)))
+        assert pdict.remove_unreferenced_values() == 1
+        assert pdict.remove_unreferenced_values() == 0
+
+        # a removed value can be stored again
+        pdict[6] = PDictTestingKeyOrValue("y")
+        assert pdict2[6] == PDictTestingKeyOrValue("y")
+
+    finally:
+        shutil.rmtree(tmpdir)
+
+
+@pytest.mark.parametrize("pdict_cls", (PersistentDict, WriteOncePersistentDict))
+def test_persistent_dict_read_only(pdict_cls):
+    import os
+    try:
+        tmpdir = tempfile.mkdtemp()
+        pdict = pdict_cls("pytools-test", container_dir=tmpdir)
+        pdict[0] = 1
+
+        # a stale lock file must not be waited on
+        with open(os.path.join(tmpdir, pdict.key_builder(0) + ".lock"), "w"):
+            pass
+
+        ro_pdict = pdict_cls("pytools-test", container_dir=tmpdir,
+                read_only=True)
+        assert ro_pdict[0] == 1
+
+        with pytest.raises(NoSuchEntryError):
+            ro_pdict.fetch(1)
+
+        with pytest.raises(ReadOnlyEntryError):
+            ro_pdict[1] = 1
+
+        with pytest.raises(ReadOnlyEntryError):
+            ro_pdict.clear()
+
+        if isinstance(ro_pdict, PersistentDict):
+            with pytest.raises(ReadOnlyEntryError):
+                del ro_pdict[0]
+
+        # the container directory is not created on construction
+        missing_dir = os.path.join(tmpdir, "does-not-exist")
+        ro_pdict = pdict_cls("pytools-test", container_dir=missing_dir,
+                read_only=True)
+        assert not os.path.exists(missing_dir)
+        with pytest.raises(NoSuchEntryError):
+            ro_pdict.fetch(0)
+
+    finally:
+        shutil.rmtree(tmpdir)
+
+
+@pytest.mark.parametrize("pdict_cls", (PersistentDict, WriteOncePersistentDict))
+def test_persistent_dict_archive(pdict_cls):
+    import os
+    try:
+        tmpdir = tempfile.mkdtemp()
+        archive = os.path.join(tmpdir, "archive.tar")
+
+        pdict = pdict_cls("pytools-test", container_dir=os.path.join(tmpdir, "a"))
+        for i in range(10):
+            pdict[i] = PDictTestingKeyOrValue(i)
+        pdict[MyStruct("hi", 1)] = "hi"
+
+        assert pdict.export_archive(archive) == 11
+
+        pdict2 = pdict_cls("pytools-test", container_dir=os.path.join(tmpdir, "b"))
+        pdict2[0] = "existing"
+
+        assert pdict2.import_archive(archive) == 10
+        assert pdict2[0] == "existing"
+        for i in range(1, 10):
+            assert pdict2[i] == PDictTestingKeyOrValue(i)
+        assert pdict2[MyStruct("hi", 1)] == "hi"
+
+        if pdict_cls is PersistentDict:
+            assert pdict2.import_archive(archive, skip_if_present=False) == 11
+            assert pdict2[0] == PDictTestingKeyOrValue(0)
+        else:
+            with pytest.raises(ReadOnlyEntryError):
+                pdict2.import_archive(archive, skip_if_present=False)
+            assert pdict2[0] == "existing"
+
+        ro_pdict = pdict_cls("pytools-test", container_dir=os.path.join(tmpdir, "a"),
+                read_only=True)
+        assert ro_pdict.export_archive(archive) == 11
+        with pytest.raises(ReadOnlyEntryError):
+            ro_pdict.import_archive(archive)
+
+    finally:
+        shutil.rmtree(tmpdir)
+
+
+# Counts calls of persistently memoized functions. This is a global, since
+# captured variables are part of the function digest and must be hashable.
+_persistent_memoize_count = [0]
+
+
+def test_persistent_memoize():
+    from pytools.persistent_dict import persistent_memoize
+
+    count = _persistent_memoize_count
+    count[0] = 0
+
+    try:
+        tmpdir = tempfile.mkdtemp()
+
+        def make_f(factor):
+            def f(x, y=0):
+                _persistent_memoize_count[0] += 1
+                return factor*x + y
+
+            return persistent_memoize(f, container_dir=tmpdir)
+
+        f = make_f(2)
+        assert f(1) == 2
+        assert f(1) == 2
+        assert f(1, y=1) == 3
+        assert count[0] == 2
+
+        # a new instance finds the results on disk
+        f = make_f(2)
+        assert f(1) == 2
+        assert f(1, y=1) == 3
+        assert count[0] == 2
+
+        # a function capturing a different value does not
+        g = make_f(3)
+        assert g(1) == 3
+        assert count[0] == 3
+
+        f.cache_clear()
+        f = make_f(2)
+        assert f(1) == 2
+        assert count[0] == 4
+
+        @persistent_memoize(container_dir=tmpdir, key=lambda x, y: x)
+        def h(x, y):
+            _persistent_memoize_count[0] += 1
+            return x
+
+        assert h(1, 2) == h(1, 3) == 1
+        assert count[0] == 5
+
+        # changed default values invalidate the results
+        def make_k(default):
+            def k(x, y=default, *, z=default):
+                _persistent_memoize_count[0] += 1
+                return x + y + z
+
+            return persistent_memoize(k, container_dir=tmpdir)
+
+        assert make_k(0)(1) == 1
+        assert make_k(100)(1) == 201
+        assert make_k(0)(1) == 1
+        assert count[0] == 7
+
+        # values the key builder cannot hash are rejected
+        not_given = object()
+
+        def m(x, y=not_given):
+            return x
+
+        with pytest.raises(TypeError):
+            persistent_memoize(m, container_dir=tmpdir)
+
+        def n(x):
+            return x + len(count)
+
+        with pytest.raises(TypeError):
+            persistent_memoize(n, container_dir=tmpdir)
+
+    finally:
+        shutil.rmtree(tmpdir)
+
+
+def test_persistent_memoize_digest_hash_seed():
+    import os
+    import subprocess
+
+    code = """if 1:
+        from pytools.persistent_dict import KeyBuilder, _get_function_digest
+
+        def f(x, y=frozenset({"c", "d"})):
+            return x in {"a", "b", "e", "f"}
+
+        print(_get_function_digest(KeyBuilder(), f))
+        """
+
+    digests = set()
+    for seed in ["1", "2", "3"]:
+        env = dict(os.environ, PYTHONHASHSEED=seed)
+        digests.add(subprocess.check_output(
+            [sys.executable, "-c", code], env=env, text=True).strip())
+
+    assert len(digests) == 1
+
+
 def test_dtype_hashing():
     np = pytest.importorskip("numpy")
 
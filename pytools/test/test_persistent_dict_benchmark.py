@@ -0,0 +1,178 @@
+"""Performance benchmarks for :mod:`pytools.persistent_dict`.
+
+These use `pytest-benchmark <https://pytest-benchmark.readthedocs.io>`__ and are
+skipped if it is not installed, and unless ``--benchmark-only`` is given. To
+record machine-readable results for comparison across releases, run e.g.::
+
+    python -m pytest pytools/test/test_persistent_dict_benchmark.py \\
+        --benchmark-only --benchmark-json=bench.json
+
+The caches are created in ``$PYTOOLS_BENCHMARK_DIR`` if set (point this at a
+tmpfs to take the disk out of the measurement), and in the default temporary
+directory otherwise.
+"""
+
+import os
+import shutil
+import tempfile
+from dataclasses import dataclass
+from typing import Tuple
+
+import pytest
+
+from pytools.persistent_dict import (
+    KeyBuilder, NoSuchEntryError, PersistentDict, WriteOncePersistentDict)
+
+
+pytest.importorskip("pytest_benchmark")
+
+
+@pytest.fixture(autouse=True)
+def _require_benchmark_only(request):
+    # Some of these write a lot of data, so keep them out of regular test runs.
+    if not request.config.getoption("benchmark_only"):
+        pytest.skip("benchmarks only run with --benchmark-only")
+
+
+@pytest.fixture
+def container_dir():
+    tmpdir = tempfile.mkdtemp(dir=os.environ.get("PYTOOLS_BENCHMARK_DIR"))
+    try:
+        yield tmpdir
+    finally:
+        shutil.rmtree(tmpdir)
+
+
+# {{{ key builder
+
+@dataclass(frozen=True)
+class DAGNode:
+    name: str
+    children: Tuple["DAGNode", ...]
+
+
+def make_flat_key(n=1000):
+    return tuple((i, f"name_{i}", float(i)) for i in range(n))
+
+
+def make_deep_key(depth=200):
+    key = ()
+    for i in range(depth):
+        key = (i, key)
+    return key
+
+
+def make_dag_key(nlevels=30, width=10):
+    # Each node references all nodes of the level below, so the key has
+    # width**nlevels paths but only nlevels*width distinct nodes.
+    level = tuple(DAGNode(f"leaf_{i}", ()) for i in range(width))
+    for ilevel in range(nlevels):
+        level = tuple(DAGNode(f"node_{ilevel}_{i}", level) for i in range(width))
+    return DAGNode("root", level)
+
+
+@pytest.mark.parametrize("make_key", [make_flat_key, make_deep_key, make_dag_key])
+def test_key_builder(benchmark, make_key):
+    keyb = KeyBuilder()
+
+    # KeyBuilder caches digests on the keys it has seen, so build fresh keys for
+    # each round.
+    benchmark.pedantic(keyb, setup=lambda: ((make_key(),), {}), rounds=50)
+
+# }}}
+
+
+# {{{ lookup
+
+def test_write_once_in_mem_hit(benchmark, container_dir):
+    pdict = WriteOncePersistentDict("pytools-bench", container_dir=container_dir)
+    pdict[0] = "value"
+    pdict.fetch(0)
+
+    benchmark(pdict.fetch, 0)
+
+
+@pytest.mark.parametrize("pdict_cls", [PersistentDict, WriteOncePersistentDict])
+def test_disk_hit(benchmark, container_dir, pdict_cls):
+    kwargs = {"in_mem_cache_size": 0} if pdict_cls is WriteOncePersistentDict else {}
+    pdict = pdict_cls("pytools-bench", container_dir=container_dir, **kwargs)
+    pdict[0] = "value"
+
+    benchmark(pdict.fetch, 0)
+
+
+@pytest.mark.parametrize("pdict_cls", [PersistentDict, WriteOncePersistentDict])
+def test_miss(benchmark, container_dir, pdict_cls):
+    pdict = pdict_cls("pytools-bench", container_dir=container_dir)
+
+    def fetch_missing():
+        try:
+            pdict.fetch(0)
+        except NoSuchEntryError:
+            pass
+
+    benchmark(fetch_missing)
+
+# }}}
+
+
+# {{{ store
+
+@pytest.mark.parametrize("pdict_cls", [PersistentDict, WriteOncePersistentDict])
+@pytest.mark.parametrize("value_size", [10, 10**6])
+def test_store(benchmark, container_dir, pdict_cls, value_size):
+    pdict = pdict_cls("pytools-bench", container_dir=container_dir)
+    value = b"x" * value_size
+
+    def setup():
+        # Store into an empty dictionary each round, without accumulating
+        # entries on disk.
+        pdict.clear()
+        return (0, value), {}
+
+    benchmark.pedantic(pdict.store, setup=setup, rounds=20)
+
+# }}}
+
+
+# {{{ multi-process contention
+
+def _store_and_fetch(args):
+    container_dir, keys = args
+    pdict = PersistentDict("pytools-bench", container_dir=container_dir)
+    for key in keys:
+        pdict[key] = key
+        try:
+            pdict.fetch(key)
+        except NoSuchEntryError:
+            # Another process may be replacing the same entry.
+            pass
+
+
+@pytest.mark.parametrize("nprocesses", [4])
+@pytest.mark.parametrize("same_key", [True, False])
+def test_contention(benchmark, container_dir, nprocesses, same_key):
+    from multiprocessing import Pool
+
+    nkeys = 20
+    if same_key:
+        work = [(container_dir, [0] * nkeys)] * nprocesses
+    else:
+        work = [
+                (container_dir, list(range(iproc * nkeys, (iproc + 1) * nkeys)))
+                for iproc in range(nprocesses)]
+
+    with Pool(nprocesses) as pool:
+        benchmark.pedantic(pool.map, args=(_store_and_fetch, work), rounds=5)
+
+# }}}
+
+
+if __name__ == "__main__":
+    import sys
+    if len(sys.argv) > 1:
+        exec(sys.argv[1])
+    else:
+        pytest.main([__file__])
+
+# vim: foldmethod=marker
@@ -23,6 +23,7 @@ THE SOFTWARE.
 
 import logging
 import sys
+import weakref
 
 import pytest
 
@@ -171,6 +172,490 @@ def test_memoize_keyfunc():
     assert count[0] == 2
 
 
+def test_memoize_use_signature():
+    from pytools import memoize, memoize_method
+    count = [0]
+
+    @memoize(use_signature=True)
+    def f(a, b=2, *args, c=3, **kwargs):
+        count[0] += 1
+        return a + b + sum(args) + c + sum(kwargs.values())
+
+    assert f(1, 2) == 6
+    assert f(1, b=2) == 6
+    assert f(a=1, b=2) == 6
+    assert f(1) == 6
+    assert f(1, c=3) == 6
+    assert count[0] == 1
+
+    assert f(1, 2, 3) == 9
+    assert f(1, d=3, e=4) == 13
+    assert f(1, e=4, d=3) == 13
+    assert count[0] == 3
+
+    with pytest.raises(TypeError):
+        f()
+
+    with pytest.raises(TypeError):
+        memoize(use_signature=True, use_kwargs=True)
+
+    class A:
+        def __init__(self):
+            self.count = 0
+
+        @memoize_method(use_signature=True)
+        def g(self, a, /, b, *, c=1):
+            self.count += 1
+            return a + b + c
+
+    a = A()
+    assert a.g(1, 2) == 4
+    assert a.g(1, b=2) == 4
+    assert a.g(1, b=2, c=1) == 4
+    assert a.count == 1
+
+    A.g.clear_cache(a)
+    assert a.g(1, 2) == 4
+    assert a.count == 2
+
+
+def test_memoize_specialize():
+    from pytools import memoize_method, memoize_on_first_arg
+
+    class A:
+        def __init__(self):
+            self.count = 0
+
+        @memoize_method(specialize=True)
+        def f(self, a, b=2):
+            self.count += 1
+            return a + b
+
+        @memoize_method(specialize=True)
+        def g(self, *args):
+            self.count += 1
+            return sum(args)
+
+    a = A()
+    assert a.f(1) == 3
+    assert a.f(1, 2) == 3
+    assert a.f(a=1, b=2) == 3
+    assert a.count == 1
+    assert a.f(2) == 4
+    assert a.count == 2
+
+    A.f.clear_cache(a)
+    assert a.f(1) == 3
+    assert a.count == 3
+
+    assert a.g(1, 2) == 3
+    assert a.g(1, 2) == 3
+    assert a.count == 4
+
+    @memoize_on_first_arg(specialize=True)
+    def h(obj, x, /):
+        obj.count += 1
+        return 2 * x
+
+    assert h(a, 1) == 2
+    assert h(a, 1) == 2
+    assert a.count == 5
+
+    with pytest.raises(TypeError):
+        memoize_method(specialize=True, thread_safe=True)(lambda self: 0)
+
+    # parameter names must not clash with names used by the generated wrapper
+    class B:
+        def __init__(self):
+            self.count = 0
+
+        @memoize_method(specialize=True)
+        def f(self, result):
+            self.count += 1
+            return 10 * result
+
+        @memoize_method(specialize=True)
+        def g(self, cache_dict):
+            self.count += 1
+            return cache_dict + 1
+
+    b = B()
+    assert b.f(1) == 10
+    assert b.f(1) == 10
+    assert b.count == 1
+    assert b.g(1) == 2
+    assert b.g(1) == 2
+    assert b.count == 2
+
+    @memoize_on_first_arg(specialize=True)
+    def k(result, x):
+        result.count += 1
+        return x
+
+    assert k(b, 5) == 5
+    assert k(b, 5) == 5
+    assert b.count == 3
+
+
+def test_memoize_maxsize():
+    from pytools import memoize, memoize_in, memoize_method
+    count = [0]
+
+    @memoize(maxsize=2)
+    def f(i):
+        count[0] += 1
+        return 2*i
+
+    assert [f(1), f(2), f(1), f(3)] == [2, 4, 2, 6]
+    assert count[0] == 3
+
+    # 2 was least recently used, so it was evicted
+    f(1)
+    assert count[0] == 3
+    f(2)
+    assert count[0] == 4
+
+    class SomeClass:
+        def __init__(self):
+            self.run_count = 0
+
+        @memoize_method(maxsize=1)
+        def g(self, i):
+            self.run_count += 1
+            return i
+
+        def h(self, i):
+            @memoize_in(self, "h", maxsize=1)
+            def inner(i):
+                self.run_count += 1
+                return i
+
+            return inner(i)
+
+    sc = SomeClass()
+    sc.g(1)
+    sc.g(1)
+    assert sc.run_count == 1
+    sc.g(2)
+    sc.g(1)
+    assert sc.run_count == 3
+    sc.g.clear_cache(sc)  # pylint: disable=no-member
+
+    sc.run_count = 0
+    sc.h(1)
+    sc.h(1)
+    sc.h(2)
+    sc.h(1)
+    assert sc.run_count == 3
+
+
+class _CountingLock:
+    """Wraps a lock, counting how often it is acquired."""
+
+    def __init__(self, lock):
+        self.lock = lock
+        self.count = 0
+
+    def __enter__(self):
+        self.count += 1
+        return self.lock.__enter__()
+
+    def __exit__(self, *args):
+        return self.lock.__exit__(*args)
+
+
+def test_memoize_thread_safe():
+    from concurrent.futures import ThreadPoolExecutor
+    from time import sleep
+
+    from pytools import memoize, memoize_in, memoize_method
+
+    nthreads = 8
+    count = [0]
+
+    def compute(i):
+        count[0] += 1
+        # give the other threads time to miss the cache
+        sleep(0.05)
+        if i < 0:
+            raise ValueError(i)
+        return 2*i
+
+    @memoize(thread_safe=True)
+    def f(i):
+        return compute(i)
+
+    class SomeClass:
+        @memoize_method(thread_safe=True)
+        def g(self, i):
+            return compute(i)
+
+        def h(self, i):
+            @memoize_in(self, "h", maxsize=10, thread_safe=True)
+            def inner(i):
+                return compute(i)
+
+            return inner(i)
+
+    sc = SomeClass()
+
+    def call_concurrently(func, arg):
+        count[0] = 0
+        with ThreadPoolExecutor(nthreads) as pool:
+            futures = [pool.submit(func, arg) for _ in range(nthreads)]
+            return [fut.exception() or fut.result() for fut in futures]
+
+    for func in [f, sc.g, sc.h]:
+        assert call_concurrently(func, 5) == [10] * nthreads
+        assert count[0] == 1
+
+        # exceptions are propagated to all waiting callers
+        results = call_concurrently(func, -1)
+        assert all(isinstance(exc, ValueError) for exc in results)
+
+    # cache hits do not take the lock
+    import pytools
+
+    class OtherClass:
+        def h(self, i):
+            @memoize_in(self, "h", thread_safe=True)
+            def inner(i):
+                return compute(i)
+
+            return inner(i)
+
+    oc = OtherClass()
+    oc.h(5)
+
+    lock = pytools._MEMOIZE_LOCK = _CountingLock(pytools._MEMOIZE_LOCK)
+    try:
+        for _ in range(100):
+            assert f(5) == sc.g(5) == oc.h(5) == 10
+        assert lock.count == 0
+    finally:
+        pytools._MEMOIZE_LOCK = lock.lock
+
+
+def test_memoize_stats():
+    import pytools
+    from pytools import (
+        enable_memoize_stats, enforce_memoize_memory_budget, memoize,
+        memoize_in, memoize_method, memoize_stats)
+
+    old_enabled = pytools._MEMOIZE_STATS_ENABLED
+    enable_memoize_stats()
+    try:
+        @memoize
+        def f(i):
+            return list(range(i))
+
+        class SomeClass:
+            @memoize_method
+            def g(self, i):
+                return i
+
+            def h(self):
+                @memoize_in(self, "h_inner")
+                def inner(i):
+                    return i
+
+                return inner(1) + inner(1)
+
+        sc = SomeClass()
+
+        f(1000)
+        f(1000)
+        f(1)
+        sc.g(1)
+        sc.h()
+
+        stats = {st.name: st for st in memoize_stats()}
+        f_stats = stats[f"{__name__}.{f.__qualname__}"]
+        assert (f_stats.hits, f_stats.misses, f_stats.entries) == (1, 2, 2)
+        assert f_stats.nbytes > 1000 * 8
+
+        g_stats = stats[f"{__name__}.{SomeClass.g.__qualname__}"]
+        assert (g_stats.hits, g_stats.misses, g_stats.entries) == (0, 1, 1)
+
+        h_stats = stats["memoize_in('h_inner')"]
+        assert (h_stats.hits, h_stats.misses, h_stats.entries) == (1, 1, 1)
+
+        all_stats = memoize_stats()
+        largest = all_stats[0]
+        total_nbytes = sum(st.nbytes for st in all_stats)
+        assert enforce_memoize_memory_budget(total_nbytes - 1) == largest.nbytes
+        assert largest.name not in {st.name for st in memoize_stats() if st.entries}
+
+        assert enforce_memoize_memory_budget(0, policy="coldest") > 0
+        assert all(st.entries == 0 for st in memoize_stats())
+
+    finally:
+        enable_memoize_stats(old_enabled)
+
+
+def test_weak_memoize():
+    import gc
+
+    from pytools import weak_memoize
+
+    class Node:
+        def __init__(self, value):
+            self.value = value
+
+    count = [0]
+
+    @weak_memoize
+    def f(node, offset):
+        count[0] += 1
+        return node.value + offset
+
+    cache = f.__wrapped__._memoize_dic
+
+    a = Node(1)
+    b = Node(2)
+    assert f(a, 1) == f(a, 1) == 2
+    assert f(b, 1) == 3
+    assert count[0] == 2
+    assert len(cache) == 2
+
+    a_ref = weakref.ref(a)
+    del a
+    gc.collect()
+    assert a_ref() is None
+    assert len(cache) == 1
+
+    assert f(b, 1) == 3
+    assert count[0] == 2
+
+
+def test_memoize_coroutine():
+    import asyncio
+
+    from pytools import memoize, memoize_in, memoize_method
+
+    count = [0]
+
+    async def compute(i):
+        count[0] += 1
+        await asyncio.sleep(0.01)
+        if i < 0:
+            raise ValueError(i)
+        return 2*i
+
+    @memoize
+    async def f(i):
+        return await compute(i)
+
+    class SomeClass:
+        @memoize_method
+        async def g(self, i):
+            return await compute(i)
+
+        async def h(self, i):
+            @memoize_in(self, "h")
+            async def inner(i):
+                return await compute(i)
+
+            return await inner(i)
+
+    sc = SomeClass()
+
+    async def check(func):
+        count[0] = 0
+        assert await asyncio.gather(*[func(5) for _ in range(4)]) == [10] * 4
+        assert await func(5) == 10
+        assert count[0] == 1
+
+        # exceptions are propagated to all callers and not cached
+        results = await asyncio.gather(
+                *[func(-1) for _ in range(4)], return_exceptions=True)
+        assert all(isinstance(exc, ValueError) for exc in results)
+        assert count[0] == 2
+        with pytest.raises(ValueError):
+            await func(-1)
+        assert count[0] == 3
+
+    for func in [f, sc.g, sc.h]:
+        asyncio.run(check(func))
+
+    # results remain available in a new event loop
+    count[0] = 0
+    assert asyncio.run(f(5)) == 10
+    assert count[0] == 0
+
+    sc.g.clear_cache(sc)  # pylint: disable=no-member
+    assert asyncio.run(sc.g(5)) == 10
+    assert count[0] == 1
+
+
+@pytest.mark.parametrize("slots", [("_pytools_memo",), ("__weakref__",)])
+@pytest.mark.parametrize("specialize", [False, True])
+def test_memoize_slots(slots, specialize):
+    from pytools import memoize_in, memoize_method
+
+    class A:
+        __slots__ = ("count", *slots)
+
+        def __init__(self):
+            self.count = 0
+
+        @memoize_method(specialize=specialize)
+        def f(self, a):
+            self.count += 1
+            return 2 * a
+
+    a = A()
+    assert a.f(1) == 2
+    assert a.f(1) == 2
+    assert a.count == 1
+
+    A.f.clear_cache(a)
+    assert a.f(1) == 2
+    assert a.count == 2
+
+    @memoize_in(a, "test_memoize_slots")
+    def g(x):
+        a.count += 1
+        return x
+
+    assert g(1) == 1
+    assert g(1) == 1
+    assert a.count == 3
+
+    if not specialize:
+        import pytools
+
+        class C(A):
+            __slots__ = ()
+
+            @memoize_method(thread_safe=True)
+            def h(self, x):
+                self.count += 1
+                return x
+
+        c = C()
+        assert c.h(1) == 1
+
+        # cache hits do not take the lock
+        lock = pytools._MEMOIZE_LOCK = _CountingLock(pytools._MEMOIZE_LOCK)
+        try:
+            assert c.h(1) == 1
+            assert lock.count == 0
+        finally:
+            pytools._MEMOIZE_LOCK = lock.lock
+        assert c.count == 1
+
+    class B:
+        __slots__ = ()
+
+        @memoize_method
+        def f(self):
+            return 0
+
+    with pytest.raises(TypeError):
+        B().f()
+
+
 def test_memoize_frozen():
     from dataclasses import dataclass
 